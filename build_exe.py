@@ -8,10 +8,15 @@ Requirements:
     pip install pyinstaller PyQt5 requests PyYAML
 
 Output:
-    dist/llms-sitemap-generator-gui.exe
+    dist/llms-sitemap-generator-gui/llms-sitemap-generator-gui.exe
+
+The app is built in --onedir mode: unlike --onefile it does not re-extract
+Qt to a temp directory on every launch, so it starts noticeably faster.
+Set UPX_DIR (or put upx on PATH) to compress the bundled binaries.
 """
 
 import PyInstaller.__main__
+import shutil
 import sys
 import os
 from pathlib import Path
@@ -31,56 +36,76 @@ def build_exe():
     args = [
         str(script_path),  # Use gui_entry.py as entry point (uses absolute imports)
         "--name=llms-sitemap-generator-gui",
-        "--onefile",  # Build as single file
+        "--onedir",  # Folder build: no per-launch self-extraction
         "--windowed",  # No console window (GUI app)
         "--icon=NONE",  # Can specify icon file path
         # Set the path so imports work correctly
         f"--paths={project_root / 'src'}",
+        # All package modules (gui_entry imports them lazily)
+        "--collect-submodules=llms_sitemap_generator",
+        # Package data: starter config template used by `init`
+        f"--add-data={project_root / 'src' / 'llms_sitemap_generator' / 'templates'}"
+        f"{os.pathsep}llms_sitemap_generator/templates",
         # Hidden imports for core dependencies
-        "--hidden-import=llms_sitemap_generator",
-        "--hidden-import=llms_sitemap_generator.cli",
-        "--hidden-import=llms_sitemap_generator.config",
-        "--hidden-import=llms_sitemap_generator.crawler",
-        "--hidden-import=llms_sitemap_generator.filters",
-        "--hidden-import=llms_sitemap_generator.generator",
-        "--hidden-import=llms_sitemap_generator.gui_main",
-        "--hidden-import=llms_sitemap_generator.html_summary",
-        "--hidden-import=llms_sitemap_generator.logger",
-        "--hidden-import=llms_sitemap_generator.site_analyzer",
-        "--hidden-import=llms_sitemap_generator.sitemap",
-        "--hidden-import=llms_sitemap_generator.subdomain_discovery",
-        "--hidden-import=llms_sitemap_generator.url_utils",
-        "--hidden-import=llms_sitemap_generator.validators",
         "--hidden-import=yaml",
         "--hidden-import=yaml.cyaml",
+        "--hidden-import=_yaml",  # libyaml C extension used by CSafeLoader
         "--hidden-import=requests",
+        "--hidden-import=orjson",  # optional fast JSON backend for llms.json
         "--hidden-import=requests.packages.urllib3",
         "--hidden-import=charset_normalizer",
         "--hidden-import=idna",
-        "--collect-all=PyQt5",  # Collect all PyQt5 dependencies
-        "--collect-submodules=PyQt5",  # Collect all PyQt5 submodules
+        # Only the Qt modules the GUI actually uses; PyInstaller's PyQt5 hooks
+        # pull in the matching plugins
+        "--collect-submodules=PyQt5.QtCore",
+        "--collect-submodules=PyQt5.QtGui",
+        "--collect-submodules=PyQt5.QtWidgets",
+        "--exclude-module=PyQt5.QtQml",
+        "--exclude-module=PyQt5.QtWebEngine",
+        "--exclude-module=PyQt5.QtNetwork",
+        "--exclude-module=PyQt5.QtTest",
+        "--exclude-module=tkinter",
+        "--exclude-module=unittest",
     ]
 
+    # UPX compression is optional: use UPX_DIR or an upx binary on PATH
+    upx_dir = os.environ.get("UPX_DIR")
+    if not upx_dir:
+        upx_bin = shutil.which("upx")
+        upx_dir = str(Path(upx_bin).parent) if upx_bin else None
+    if upx_dir:
+        args.append(f"--upx-dir={upx_dir}")
+    else:
+        args.append("--noupx")
+
+    # Stripping symbols is not supported/recommended for Windows binaries
+    if sys.platform != "win32":
+        args.append("--strip")
+
     print("=" * 60)
     print("LLMS Sitemap Generator - EXE Build")
     print("=" * 60)
     print(f"\nProject root: {project_root}")
     print(f"Entry script: {script_path}")
-    print(f"Output: dist/llms-sitemap-generator-gui.exe")
+    print(f"Output: dist/llms-sitemap-generator-gui/")
     print()
 
     print("Building executable...")
     sys.argv = ["pyinstaller"] + args
     PyInstaller.__main__.run(args)
 
-    exe_path = project_root / "dist" / "llms-sitemap-generator-gui.exe"
+    dist_dir = project_root / "dist" / "llms-sitemap-generator-gui"
+    exe_name = "llms-sitemap-generator-gui" + (".exe" if sys.platform == "win32" else "")
+    exe_path = dist_dir / exe_name
     if exe_path.exists():
-        size_mb = exe_path.stat().st_size / (1024 * 1024)
+        size_mb = sum(
+            f.stat().st_size for f in dist_dir.rglob("*") if f.is_file()
+        ) / (1024 * 1024)
         print()
         print("=" * 60)
         print(f"[SUCCESS] Build completed!")
         print(f"Executable: {exe_path}")
-        print(f"Size: {size_mb:.2f} MB")
+        print(f"Bundle size: {size_mb:.2f} MB")
         print("=" * 60)
     else:
         print(f"[ERROR] Build failed - executable not found at {exe_path}")
@@ -16,3 +16,16 @@ __all__ = [
 ]
 
 __version__ = "0.2.0"
+
+_LAZY_SUBMODULES = frozenset(name for name in __all__ if name != "__version__")
+
+
+def __getattr__(name):
+    # PEP 562：子模块按需导入，`import llms_sitemap_generator` 不会拉起 requests / yaml 等依赖
+    if name in _LAZY_SUBMODULES:
+        import importlib
+
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,13 +1,24 @@
 import argparse
 import sys
+from functools import lru_cache
 from pathlib import Path
 
-from .config import load_config
-from .generator import generate_llms_txt
-
 
 DEFAULT_CONFIG_NAME = "llmstxt.config.yml"
 
+# 进程内复用的 HTTP 会话（连接池），首次需要联网的子命令才会创建
+_SESSION = None
+
+
+def _get_session():
+    """Return the process-wide pooled requests.Session, creating it lazily."""
+    global _SESSION
+    if _SESSION is None:
+        from .http_session import create_session
+
+        _SESSION = create_session(pool_connections=16, pool_maxsize=16)
+    return _SESSION
+
 
 def cmd_init(args):
     """Create a starter config file in the current directory."""
@@ -16,83 +27,27 @@ def cmd_init(args):
         print(f"[WARN] Config file already exists: {target}", file=sys.stderr)
         return 1
 
-    template = f"""# LLMS Sitemap Generator config
-#
-# 你通常只需要改这几个地方：
-# 1）site.base_url      —— 你的网站主域名
-# 2）sources            —— sitemap 或起始爬取 URL
-# 3）filters.include    —— 想重点保留的路径段（产品 / 文档 / 定价等）
-# 4）filters.exclude    —— 明确不要的路径段（博客 / 招聘 / 新闻等）
-
-site:
-  base_url: "https://example.com"
-  default_language: "en"
-
-sources:
-  # 优先推荐：直接从 sitemap 导入 URL（如有 sitemap.xml）
-  - type: "sitemap"
-    url: "https://example.com/sitemap.xml"
-
-  # 备用方案：没有 sitemap 时，从首页或文档入口做爬取
-  # - type: "crawl"
-  #   url: "https://example.com/"
-  #   max_depth: 2
-  #   max_urls: 1000
-
-filters:
-  include:
-    # 示例：产品
-    - pattern: "^/products"
-      group: "Products"
-      priority: 100
-
-    # 示例：文档
-    - pattern: "^/docs"
-      group: "Docs"
-      priority: 90
-
-    # 示例：定价
-    - pattern: "^/pricing"
-      group: "Pricing"
-      priority: 80
-
-  exclude:
-    # 示例：博客 / 新闻 / 招聘 等通常不希望进入 llms.txt 的内容
-    - pattern: "blog"
-    - pattern: "news"
-    - pattern: "^/careers"
-
-        # 全站最多保留的 URL 数量（在 include/exclude 之后）
-        # 建议控制在 500~2000 之间，保证 llms.txt 更「精选」
-        max_urls: 1000
-
-  # 自动按路径首段分组，如 /products/... -> "Products"
-  auto_group: true
-
-  # 每个分组的最大条数（按 score 排序截断）
-  group_limits:
-    Products: 100
-    Docs: 200
-    Pricing: 50
-
-  # 内置一些通用排除规则（如 /search, /wp-admin 等），通常不需要改
-  use_default_excludes: true
-
-output:
-  llms_txt: "llms.txt"
-  # 可选：输出更长的 llms-full.txt 与 JSON
-  llms_full_txt: "llms-full.txt"
-  llms_json: "llms.json"
-  # 可选：输出标准 sitemap.xml
-  sitemap_xml: "sitemap.xml"
-"""
-    target.write_text(template, encoding="utf-8")
+    # 模板作为包内资源随包分发，直接整文件复制
+    import shutil
+    from importlib import resources
+
+    template = (
+        resources.files("llms_sitemap_generator")
+        .joinpath("templates")
+        .joinpath(DEFAULT_CONFIG_NAME)
+    )
+    with resources.as_file(template) as template_path:
+        shutil.copyfile(template_path, target)
     print(f"[OK] Created config file: {target}")
     return 0
 
 
 def cmd_generate(args):
     """Placeholder for generate command (will implement sitemap & llms.txt soon)."""
+    # 延迟导入：init / gui 等子命令无需加载 generator / crawler / requests
+    from .config import load_config
+    from .generator import generate_llms_txt
+
     config_path = Path(args.config or DEFAULT_CONFIG_NAME)
     if not config_path.exists():
         print(
@@ -104,7 +59,7 @@ def cmd_generate(args):
 
     try:
         # 默认启用验证，但可以通过 --no-validate 跳过
-        validate = not getattr(args, "no_validate", False)
+        validate = not args.no_validate
         config = load_config(config_path, validate=validate)
     except ValueError as e:
         # 配置验证错误，提供更友好的提示
@@ -118,22 +73,23 @@ def cmd_generate(args):
 
     output_path = Path(config.output.llms_txt)
 
-    only_groups_list = None
-    if getattr(args, "only_groups", None):
-        only_groups_list = [g.strip() for g in args.only_groups.split(",") if g.strip()]
+    only_groups_list = [
+        g.strip() for g in (args.only_groups or "").split(",") if g.strip()
+    ] or None
 
     generate_llms_txt(
         config,
         output_path,
-        dry_run=bool(getattr(args, "dry_run", False)),
-        max_pages=getattr(args, "max_pages", None),
-        fetch_content=not bool(getattr(args, "no_fetch", False)),
-        profile=getattr(args, "profile", None),
+        dry_run=args.dry_run,
+        max_pages=args.max_pages,
+        fetch_content=not args.no_fetch,
+        profile=args.profile,
         only_groups=only_groups_list,
     )
     return 0
 
 
+@lru_cache(maxsize=None)
 def build_parser():
     parser = argparse.ArgumentParser(
         prog="llms-sitemap-generator",
@@ -172,29 +128,35 @@ def build_parser():
     p_gen.add_argument(
         "--dry-run",
         action="store_true",
+        default=False,
         help="Do not write files; only print counts and sample URLs after filtering.",
     )
     p_gen.add_argument(
         "--max-pages",
         type=int,
+        default=None,
         help="Limit the number of pages processed after filtering (for quick tests).",
     )
     p_gen.add_argument(
         "--no-fetch",
         action="store_true",
+        default=False,
         help="Do not fetch page content; use URL as title and a generic description.",
     )
     p_gen.add_argument(
         "--profile",
+        default=None,
         help="Named profile from config.filters.profiles to select which groups to keep.",
     )
     p_gen.add_argument(
         "--only-groups",
+        default=None,
         help="Comma-separated list of groups to keep (overrides profile).",
     )
     p_gen.add_argument(
         "--no-validate",
         action="store_true",
+        default=False,
         help="Skip configuration validation (not recommended).",
     )
     p_gen.set_defaults(func=cmd_generate)
@@ -230,7 +192,6 @@ def build_parser():
 
 def cmd_analyze(args):
     """Analyze website and generate recommended configuration."""
-    import requests
     import yaml
     from .site_analyzer import recommend_config
 
@@ -242,8 +203,7 @@ def cmd_analyze(args):
     print("[INFO] This may take a minute...")
 
     try:
-        session = requests.Session()
-        recommendations = recommend_config(url, session)
+        recommendations = recommend_config(url, _get_session())
 
         # Generate config YAML
         config_data = {
@@ -273,9 +233,17 @@ def cmd_analyze(args):
             )
             return 1
 
-        # Write config file
+        # Write config file (prefer the libyaml-backed dumper when available)
+        dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
         with open(output_path, "w", encoding="utf-8") as f:
-            yaml.dump(config_data, f, default_flow_style=False, allow_unicode=True)
+            yaml.dump(
+                config_data,
+                f,
+                Dumper=dumper,
+                default_flow_style=False,
+                allow_unicode=True,
+                sort_keys=False,
+            )
 
         print(f"\n[OK] Recommended configuration written to: {output_path}")
         print("\n[USAGE] To generate llms.txt, run:")
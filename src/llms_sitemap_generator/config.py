@@ -1,14 +1,27 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from urllib.parse import urlparse
+from typing import Any, Dict, List, Optional, Set
 
 import yaml
 
+try:
+    # libyaml-backed loader; much faster than the pure-Python SafeLoader
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - depends on how PyYAML was built
+    from yaml import SafeLoader as _YamlLoader
 
-@dataclass
+# Python 3.10+ 上使用 __slots__ 数据类：实例无 __dict__，内存更小、属性访问更快
+_DATACLASS_OPTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_OPTS)
 class SourceConfig:
     type: str
     url: str
@@ -18,21 +31,23 @@ class SourceConfig:
     urls: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class FilterRule:
     pattern: str
     group: Optional[str] = None
     priority: int = 0
+    # 预编译的正则，由 load_config 填充；手工构造的规则为 None，匹配时按需编译
+    compiled: Optional[re.Pattern] = field(default=None, repr=False, compare=False)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class ProfileConfig:
     """A named profile that selects which groups to keep for a given run."""
 
     include_groups: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class FiltersConfig:
     include: List[FilterRule] = field(default_factory=list)
     exclude: List[FilterRule] = field(default_factory=list)
@@ -48,7 +63,7 @@ class FiltersConfig:
     auto_filter_languages: bool = True
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class OutputConfig:
     llms_txt: str = "llms.txt"
     llms_full_txt: Optional[str] = None
@@ -63,7 +78,21 @@ class OutputConfig:
     generate_full_text: bool = False
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
+class FetchConfig:
+    # 生成 llms.txt 时并发抓取页面标题/描述的线程数（1 表示逐个抓取）
+    concurrency: int = 8
+    # 使用 aiohttp + asyncio 抓取（需安装可选依赖 aiohttp）；此时 concurrency 为单个主机的并发连接上限
+    async_enabled: bool = False
+    # 自定义 User-Agent（为空时使用默认的 llms-sitemap-generator UA）
+    user_agent: Optional[str] = None
+    # 页面摘要缓存目录（为空则不缓存）；重复运行时按 ETag / Last-Modified 条件请求，未变化的页面不再下载解析
+    cache_dir: Optional[str] = None
+    # 缓存条目在该秒数内直接复用、不发请求；0 表示每次都重新校验
+    cache_ttl: int = 0
+
+
+@dataclass(**_DATACLASS_OPTS)
 class SiteConfig:
     base_url: str
     default_language: str = "en"
@@ -71,41 +100,182 @@ class SiteConfig:
     description: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class AppConfig:
     site: SiteConfig
     sources: List[SourceConfig]
     filters: FiltersConfig
     output: OutputConfig
+    fetch: FetchConfig = field(default_factory=FetchConfig)
+    # 运行期选项（不来自配置文件，由 GUI 等调用方设置）
+    enable_auto_subdomains: bool = False
+    selected_subdomains: Optional[Set[str]] = None
+    polite_crawl: bool = True
 
 
 def _load_raw_config(path: Path) -> Dict[str, Any]:
-    data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    data = yaml.load(path.read_text(encoding="utf-8"), Loader=_YamlLoader) or {}
     if not isinstance(data, dict):
         raise ValueError("Config root must be a mapping")
     return data
 
 
-def load_config(path: Path, validate: bool = True) -> AppConfig:
+def _host(url: str) -> str:
+    """
+    Return the lower-cased netloc of url, same as urlparse(url).netloc.lower().
+
+    只在加载配置时取一次主机名，手工切片即可，无需构造完整的 ParseResult。
+    """
+    _, sep, rest = url.partition("://")
+    if not sep:
+        return ""
+    end = len(rest)
+    for ch in "/?#":
+        i = rest.find(ch, 0, end)
+        if i != -1:
+            end = i
+    return rest[:end].lower()
+
+
+def _interned_str(value: Any) -> str:
+    return sys.intern(str(value))
+
+
+_REQUIRED = object()
+
+# 各配置段的标量字段：key -> (类型转换函数, 默认值)
+# 类型为 None 表示原样保留；默认值为 _REQUIRED 表示缺失时报错
+_SCHEMA: Dict[str, Dict[str, tuple]] = {
+    "site": {
+        "base_url": (str, _REQUIRED),
+        # 语言 / 分组 / source 类型等短字符串在过滤阶段被反复比较，驻留后可走指针相等的快速路径
+        "default_language": (_interned_str, "en"),
+        "description": (str, None),
+    },
+    "filters": {
+        "max_urls": (int, 1000),
+        "auto_group": (bool, True),
+        "default_group_limit": (int, None),
+        "use_default_excludes": (bool, True),
+        "auto_filter_languages": (bool, True),
+    },
+    "output": {
+        "llms_txt": (str, "llms.txt"),
+        "llms_full_txt": (None, None),
+        "llms_json": (None, None),
+        "sitemap_xml": (None, None),
+        "sitemap_index": (None, None),
+        "generate_full_text": (bool, False),
+        "sitemap_apply_filters": (bool, False),
+    },
+    "fetch": {
+        "concurrency": (int, 8),
+        "async_enabled": (bool, False),
+        "user_agent": (str, None),
+        "cache_dir": (str, None),
+        "cache_ttl": (int, 0),
+    },
+}
+
+
+def _walk_section(section: str, raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce the scalar fields of one config section according to _SCHEMA in a single pass."""
+    values: Dict[str, Any] = {}
+    for key, (coerce, default) in _SCHEMA[section].items():
+        value = raw.get(key)
+        if value is None:
+            if default is _REQUIRED:
+                raise ValueError(f"Config `{section}.{key}` is required")
+            values[key] = default
+        else:
+            values[key] = value if coerce is None else coerce(value)
+    return values
+
+
+def _parse_filter_rules(rules_raw: Optional[List[Dict[str, Any]]]) -> List[FilterRule]:
+    """Build FilterRule objects from raw include/exclude entries, skipping empty patterns."""
+    rules: List[FilterRule] = []
+    for r in rules_raw or []:
+        pattern = r.get("pattern")
+        if not pattern:
+            continue
+        group = r.get("group")
+        rules.append(
+            FilterRule(
+                pattern=str(pattern),
+                group=sys.intern(str(group)) if group else None,
+                priority=int(r.get("priority", 0)),
+            )
+        )
+    return rules
+
+
+# 设置 LLMS_SMG_CACHE=1 后，YAML 解析结果按 (路径, mtime, 大小, 版本) 以 JSON 缓存到磁盘，重复运行可跳过 YAML 解析；
+# 缓存的是纯数据（不用 pickle），缓存目录被篡改也不会执行任意代码
+_CACHE_ENV = "LLMS_SMG_CACHE"
+
+
+def _config_cache_file(path: Path) -> Path:
+    digest = hashlib.sha1(str(path).encode("utf-8")).hexdigest()
+    return Path.home() / ".cache" / "llms-sitemap-generator" / f"{digest}.json"
+
+
+def _cached_raw_config(path: Path) -> Dict[str, Any]:
+    """Load the raw config mapping through an on-disk JSON cache keyed on file stat + package version."""
+    from . import __version__
+
+    path = path.resolve()
+    st = path.stat()
+    key = [str(path), st.st_mtime_ns, st.st_size, __version__]
+    cache_file = _config_cache_file(path)
+
+    try:
+        cached = json.loads(cache_file.read_text(encoding="utf-8"))
+        if cached["key"] == key and isinstance(cached["raw"], dict):
+            return cached["raw"]
+    except Exception:  # noqa: BLE001 - missing/corrupt cache just means a miss
+        pass
+
     raw = _load_raw_config(path)
+    tmp_name = None
+    try:
+        text = json.dumps({"key": key, "raw": raw}, ensure_ascii=False)
+        # 日期、非字符串键等无法按原样写成 JSON 的配置不缓存
+        if json.loads(text)["raw"] != raw:
+            return raw
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_name, cache_file)
+    except Exception:  # noqa: BLE001 - caching is best-effort
+        if tmp_name and os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+    return raw
+
+
+def load_config(path: Path, validate: bool = True) -> AppConfig:
+    if os.environ.get(_CACHE_ENV) == "1":
+        return _build_config(_cached_raw_config(Path(path)))
+    return _build_config(_load_raw_config(path))
 
-    if "site" not in raw or "base_url" not in raw["site"]:
-        raise ValueError("Config `site.base_url` is required")
 
-    base_url = str(raw["site"]["base_url"]).rstrip("/")
-    default_language = str(raw["site"].get("default_language", "en"))
-    allowed_domains_raw = raw["site"].get("allowed_domains") or []
+def _build_config(raw: Dict[str, Any]) -> AppConfig:
+    site_raw = raw.get("site") or {}
+    site_values = _walk_section("site", site_raw)
+    base_url = site_values["base_url"].rstrip("/")
+    allowed_domains_raw = site_raw.get("allowed_domains") or []
     if allowed_domains_raw:
         allowed_domains = [str(h).lower() for h in allowed_domains_raw]
     else:
-        host = urlparse(base_url).netloc.lower()
+        host = _host(base_url)
         allowed_domains = [host] if host else []
 
     site = SiteConfig(
         base_url=base_url,
-        default_language=default_language,
+        default_language=site_values["default_language"],
         allowed_domains=allowed_domains,
-        description=str(raw["site"].get("description")) if raw["site"].get("description") is not None else None,
+        description=site_values["description"],
     )
 
     sources_raw = raw.get("sources") or []
@@ -115,7 +285,7 @@ def load_config(path: Path, validate: bool = True) -> AppConfig:
     for s in sources_raw:
         if "type" not in s:
             continue
-        stype = str(s["type"])
+        stype = sys.intern(str(s["type"]))
         url = str(s.get("url", ""))
         urls = [str(u) for u in (s.get("urls") or [])]
         sources.append(
@@ -131,72 +301,47 @@ def load_config(path: Path, validate: bool = True) -> AppConfig:
         raise ValueError("Config `sources` must contain valid entries with type and url")
 
     filters_raw = raw.get("filters") or {}
-    include_rules = [
-        FilterRule(
-            pattern=str(r.get("pattern", "")),
-            group=r.get("group"),
-            priority=int(r.get("priority", 0)),
-        )
-        for r in filters_raw.get("include") or []
-        if r.get("pattern")
-    ]
-    exclude_rules = [
-        FilterRule(
-            pattern=str(r.get("pattern", "")),
-            group=r.get("group"),
-            priority=int(r.get("priority", 0)),
-        )
-        for r in filters_raw.get("exclude") or []
-        if r.get("pattern")
-    ]
+    include_rules = _parse_filter_rules(filters_raw.get("include"))
+    exclude_rules = _parse_filter_rules(filters_raw.get("exclude"))
+    for r in include_rules + exclude_rules:
+        try:
+            r.compiled = re.compile(r.pattern)
+        except re.error as e:
+            raise ValueError(f"Invalid filter pattern {r.pattern!r}: {e}") from e
+    # 高优先级的 include 规则先匹配（稳定排序，同优先级保持配置顺序）
+    include_rules.sort(key=lambda r: -r.priority)
 
     profiles_raw = filters_raw.get("profiles") or {}
     profiles: Dict[str, ProfileConfig] = {}
     for name, pdata in profiles_raw.items():
         include_groups = pdata.get("include_groups") or []
         profiles[name] = ProfileConfig(
-            include_groups=[str(g) for g in include_groups],
+            include_groups=[sys.intern(str(g)) for g in include_groups],
         )
 
     group_limits_raw = filters_raw.get("group_limits") or {}
     group_limits: Dict[str, int] = {}
     for gname, limit in group_limits_raw.items():
         try:
-            group_limits[str(gname)] = int(limit)
+            group_limits[sys.intern(str(gname))] = int(limit)
         except Exception:
             continue
 
     filters = FiltersConfig(
         include=include_rules,
         exclude=exclude_rules,
-        max_urls=int(filters_raw.get("max_urls", 1000)),
-        auto_group=bool(filters_raw.get("auto_group", True)),
         profiles=profiles,
         group_limits=group_limits,
-        default_group_limit=(
-            int(filters_raw["default_group_limit"])
-            if "default_group_limit" in filters_raw
-            else None
-        ),
-        use_default_excludes=bool(filters_raw.get("use_default_excludes", True)),
-        auto_filter_languages=bool(filters_raw.get("auto_filter_languages", True)),
+        **_walk_section("filters", filters_raw),
     )
 
-    output_raw = raw.get("output") or {}
-    llms_full_txt = output_raw.get("llms_full_txt")
+    output_values = _walk_section("output", raw.get("output") or {})
     # 兼容老配置：如果只设置了 generate_full_text，则默认输出 llms-full.txt
-    if not llms_full_txt and output_raw.get("generate_full_text"):
-        llms_full_txt = "llms-full.txt"
-
-    output = OutputConfig(
-        llms_txt=str(output_raw.get("llms_txt", "llms.txt")),
-        llms_full_txt=llms_full_txt,
-        llms_json=output_raw.get("llms_json"),
-        sitemap_xml=output_raw.get("sitemap_xml"),
-        sitemap_index=output_raw.get("sitemap_index"),
-        generate_full_text=bool(output_raw.get("generate_full_text", False)),
-        sitemap_apply_filters=bool(output_raw.get("sitemap_apply_filters", False)),
-    )
+    if not output_values["llms_full_txt"] and output_values["generate_full_text"]:
+        output_values["llms_full_txt"] = "llms-full.txt"
+
+    output = OutputConfig(**output_values)
+    fetch = FetchConfig(**_walk_section("fetch", raw.get("fetch") or {}))
 
-    return AppConfig(site=site, sources=sources, filters=filters, output=output)
+    return AppConfig(site=site, sources=sources, filters=filters, output=output, fetch=fetch)
 
@@ -1,134 +1,354 @@
 from __future__ import annotations
 
-import heapq
+import html
+import re
+import sys
+import threading
 from collections import deque
-from typing import List, Optional, Set, Tuple
-from urllib.parse import urljoin, urlparse, urldefrag
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlparse
 import time
 
 import requests
-from html.parser import HTMLParser
 
 from .logger import get_logger
-from .url_utils import normalize_url, should_skip_by_extension, is_same_root_domain
+from .url_utils import (
+    is_same_root_domain,
+    normalize_url,
+    path_has_skipped_extension,
+)
 
 logger = get_logger(__name__)
 
 
-def _is_allowed_domain(url: str, allowed_hosts: Set[str]) -> bool:
-    u = urlparse(url)
-    host = (u.netloc or "").lower()
+def _host_allowed(host: str, allowed_hosts: Set[str]) -> bool:
+    """host is an already-parsed, lower-cased netloc."""
     return bool(host) and host in allowed_hosts
 
 
+# URL 优先级关键字表（B2B SaaS 场景），按层级合并为单个预编译正则，保持子串匹配语义
+_HIGH_PRIORITY_PATHS = (
+    "/products",
+    "/pricing",
+    "/docs",
+    "/documentation",
+    "/features",
+    "/solutions",
+    "/api",
+    "/guides",
+    "/blog",  # Moved blog to high priority to ensure all articles are collected
+)
+_MEDIUM_PRIORITY_PATHS = (
+    "/resources",
+    "/case-studies",
+    "/about",
+    "/contact",
+    "/help",
+    "/faq",
+    "/integrations",
+)
+_LOW_PRIORITY_PATHS = (
+    "/careers",
+    "/jobs",
+    "/press",
+    "/news",
+    "/legal",
+    "/privacy",
+    "/terms",
+    "/cookies",
+)
+
+
+def _keywords_regex(keywords: Tuple[str, ...]) -> "re.Pattern[str]":
+    return re.compile("|".join(re.escape(k) for k in keywords))
+
+
+_HIGH_PRIORITY_RE = _keywords_regex(_HIGH_PRIORITY_PATHS)
+_MEDIUM_PRIORITY_RE = _keywords_regex(_MEDIUM_PRIORITY_PATHS)
+_LOW_PRIORITY_RE = _keywords_regex(_LOW_PRIORITY_PATHS)
+
+# crawl_site 内 URL 解析 / 路径优先级缓存的容量（每次爬取单独一份）
+_URL_CACHE_SIZE = 65536
+
+
+def _parsed(url: str) -> Tuple[str, str, str]:
+    """
+    Return (scheme, lower-cased netloc, lower-cased path) for url.
+
+    crawl_site 在每次爬取内用 lru_cache 包装本函数：同一个规范化 URL 往往被几十个页面
+    （导航栏、页脚）重复链接，缓存解析结果避免重复 urlparse。
+    """
+    u = urlparse(url)
+    # host 只有少数几种，驻留后与 allowed_hosts 比较时可直接命中指针相等的快速路径
+    return u.scheme, sys.intern((u.netloc or "").lower()), u.path.lower()
+
+
 def _get_url_priority(url: str) -> int:
     """
     Calculate priority score for a URL. Higher score = higher priority.
     B2B SaaS sites: prioritize product, pricing, docs pages.
     """
-    path = urlparse(url).path.lower()
-
-    # High priority paths (B2B SaaS focus)
-    high_priority = [
-        "/products",
-        "/pricing",
-        "/docs",
-        "/documentation",
-        "/features",
-        "/solutions",
-        "/api",
-        "/guides",
-        "/blog",  # Moved blog to high priority to ensure all articles are collected
-    ]
-    for hp in high_priority:
-        if hp in path:
-            return 3
-
-    # Medium priority paths
-    medium_priority = [
-        "/resources",
-        "/case-studies",
-        "/about",
-        "/contact",
-        "/help",
-        "/faq",
-        "/integrations",
-    ]
-    for mp in medium_priority:
-        if mp in path:
-            return 2
-
-    # Low priority paths
-    low_priority = [
-        "/careers",
-        "/jobs",
-        "/press",
-        "/news",
-        "/legal",
-        "/privacy",
-        "/terms",
-        "/cookies",
-    ]
-    for lp in low_priority:
-        if lp in path:
-            return 0
+    return _path_priority(_parsed(url)[2])
 
+
+def _path_priority(path: str) -> int:
+    """_get_url_priority for an already-parsed, lower-cased path."""
+    if _HIGH_PRIORITY_RE.search(path):
+        return 3
+    if _MEDIUM_PRIORITY_RE.search(path):
+        return 2
+    if _LOW_PRIORITY_RE.search(path):
+        return 0
     # Default priority
     return 1
 
 
-class _LinkExtractor(HTMLParser):
-    def __init__(self) -> None:
-        super().__init__()
-        self.links: Set[str] = set()
+def _join_href(base_url: str, origin: str, href: str) -> str:
+    """
+    Resolve href against base_url, dropping any fragment.
+
+    站内绝对路径（/docs/...）直接与 origin 拼接，省去 urljoin 的完整解析；
+    其余情况（相对路径、含 ./ ../ 的路径、协议相对 URL 等）仍交给 urljoin。
+    """
+    href = href.strip().partition("#")[0]
+    if href.startswith("/") and not href.startswith("//") and "/." not in href:
+        return origin + href
+    return urljoin(base_url, href)
+
+
+# 合法链接的开头：绝对 http(s) URL、站内路径、查询串或 ./ ../ 相对路径
+# （空串、javascript: / mailto: / tel: / # 等都不满足，无需单独判断）
+_CRAWLABLE_HREF_PREFIXES = ("http://", "https://", "/", "?", "./", "../")
+
+
+def _is_crawlable_href(href: str, class_attr: Optional[str] = None) -> bool:
+    """Return True if an <a href> looks like a real navigation link worth following."""
+    href_l = href.strip().lower()
+    if not href_l.startswith(_CRAWLABLE_HREF_PREFIXES):
+        return False
+    # 过滤掉明显错误/噪声的 href：
+    # - 含有 React/前端 className 片段（在 href 中或 class 属性中，含 /className/page/2 这类路径）
+    # - 纯邮箱样式但未以 mailto: 开头（很大概率是从 email 文本误解析出来的「链接」）
+    if "classname" in href_l:
+        return False
+    if "@" in href_l and not href_l.startswith(("http://", "https://")):
+        return False
+    if class_attr:
+        class_val = class_attr.lower()
+        if "classname" in class_val or "react" in class_val:
+            return False
+    return True
+
+
+# 只关心 <a href>：注释、<script> 和 <style> 内容整体跳过（与 HTML 解析器的行为一致，
+# 未闭合时一直跳到页面末尾），属性值允许带引号的 ">"
+_A_TAG_RE = re.compile(
+    rb"""<!--.*?(?:-->|\Z)|<(script|style)\b.*?(?:</\1\s*>|\Z)|<a\s((?:[^>"']|"[^"]*"|'[^']*')*)>""",
+    re.IGNORECASE | re.DOTALL,
+)
+_ATTR_RE = re.compile(rb"""([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?""")
+# 超大页面只扫描前 4 MiB，避免病态页面拖慢整个爬取
+_MAX_LINK_SCAN_BYTES = 4 * 1024 * 1024
+
+
+def _extract_links(content: bytes) -> Set[str]:
+    """
+    Extract followable <a href> values from raw HTML bytes.
 
-    def handle_starttag(self, tag, attrs):
-        if tag.lower() != "a":
-            return
+    直接在响应字节上做正则扫描：无需先按字符集解码整页，也不经过逐标签回调的 HTMLParser。
+    属性值按 UTF-8 解码并反转义 HTML 实体（&amp; 等）。
+    """
+    links: Set[str] = set()
+    for m in _A_TAG_RE.finditer(content, 0, _MAX_LINK_SCAN_BYTES):
+        attrs = m.group(2)
+        if attrs is None:
+            # comment, <script> or <style> block
+            continue
         href = None
-        # Check for class attribute to detect React/className noise
-        has_classname_attr = False
-        for k, v in attrs:
-            if k.lower() == "href":
-                href = v
-            elif k.lower() == "class" and v:
-                # Check if class contains "className" or other React-like patterns
-                class_val = str(v).lower()
-                if "classname" in class_val or "react" in class_val:
-                    has_classname_attr = True
-        
-        if not href:
-            return
-        
-        href_l = href.strip().lower()
-        # 明显不是正常导航链接的 href 直接跳过
-        if href_l.startswith(("javascript:", "mailto:", "tel:", "#")):
-            return
-        
-        # 过滤掉明显错误/噪声的 href：
-        # - 含有 React/前端 className 片段（在 href 中或 class 属性中）
-        # - 纯邮箱样式但未以 mailto: 开头
-        # - 包含 /className/ 路径（React 错误注入）
-        # - 包含 /page/ 但路径看起来不正常（如 /className/page/2）
-        if "classname" in href_l or has_classname_attr:
-            return
-        if "/className/" in href_l or "/classname/" in href_l:
-            return
-        # Filter out suspicious pagination URLs that contain className
-        if "/page/" in href_l and ("classname" in href_l or "className" in href_l):
-            return
-        if "@" in href_l and not href_l.startswith(("http://", "https://")):
-            # 很大概率是从 email 文本误解析出来的「链接」
-            return
-        
-        # Additional validation: check if href looks like a valid URL path
-        # Skip URLs that are clearly malformed (e.g., just "className" or similar)
-        if href_l and not href_l.startswith(("http://", "https://", "/", "?")):
-            # Relative URLs should start with / or ?
-            if not href_l.startswith(("./", "../")):
-                return
-        
-        self.links.add(href)
+        class_attr = None
+        for a in _ATTR_RE.finditer(attrs):
+            name = a.group(1).lower()
+            if name != b"href" and name != b"class":
+                continue
+            raw = a.group(2)
+            if raw is None:
+                raw = a.group(3)
+            if raw is None:
+                raw = a.group(4)
+            if raw is None:
+                continue
+            value = raw.decode("utf-8", "replace")
+            if "&" in value:
+                value = html.unescape(value)
+            if name == b"href":
+                href = value
+            else:
+                class_attr = value
+        if href and _is_crawlable_href(href, class_attr):
+            links.add(href)
+    return links
+
+
+class _Frontier:
+    """
+    Crawl frontier bucketed by URL priority (0-3, see _get_url_priority).
+
+    优先级只有 4 档，用每档一个 deque 代替堆：push / pop 都是 O(1)，
+    同档内保持先进先出，出队顺序与 (-priority, 入队序号) 的小顶堆一致。
+    """
+
+    __slots__ = ("_buckets", "_size")
+
+    def __init__(self) -> None:
+        self._buckets: List[deque] = [deque() for _ in range(4)]
+        self._size = 0
+
+    def push(self, url: str, depth: int, priority: int) -> None:
+        self._buckets[priority].append((url, depth))
+        self._size += 1
+
+    def pop(self) -> Tuple[str, int]:
+        for bucket in reversed(self._buckets):
+            if bucket:
+                self._size -= 1
+                return bucket.popleft()
+        raise IndexError("pop from empty frontier")
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def _fetch_with_retries(
+    session: requests.Session,
+    url: str,
+    *,
+    polite: bool,
+    request_delay_s: float,
+    max_retries: int,
+) -> Tuple[Optional[requests.Response], Optional[Exception], Optional[int]]:
+    """
+    Fetch url with polite delay + retry/backoff for 429/5xx.
+    Returns (response, None, status) on success, (None, last_error, last_status) on failure;
+    the status is None when the last attempt got no HTTP response at all, and the error is
+    None when it ended with a 404 or a 429/5xx that was still failing after the last retry.
+
+    The request is streamed: only headers have been read when this returns, and the
+    caller decides whether to download the body (or close the response).
+    """
+    last_err: Exception | None = None
+    last_status: int | None = None
+    resp = None
+    for attempt in range(max_retries + 1):
+        last_err = None
+        last_status = None
+        try:
+            if polite and request_delay_s > 0:
+                time.sleep(request_delay_s)
+            resp = session.get(url, timeout=20, stream=True)
+            last_status = resp.status_code
+            # 对 404 直接放弃，不做指数重试，避免在明显死链上浪费大量时间
+            if resp.status_code == 404:
+                logger.warning(
+                    f"404 Not Found for {url}; skipping retries "
+                    f"(attempt {attempt + 1}/{max_retries + 1})"
+                )
+                resp.close()
+                resp = None
+                break
+            # Handle 429 with backoff / Retry-After
+            if resp.status_code == 429:
+                retry_after = resp.headers.get("Retry-After")
+                sleep_s = 2.0 * (2**attempt)
+                if retry_after:
+                    try:
+                        sleep_s = max(sleep_s, float(retry_after))
+                    except Exception:
+                        pass
+                resp.close()
+                resp = None
+                # 最后一次仍是 429：按失败返回（带状态码），不再等待
+                if attempt >= max_retries:
+                    break
+                logger.warning(
+                    f"429 Too Many Requests for {url}; backing off {sleep_s:.1f}s (attempt {attempt + 1}/{max_retries + 1})"
+                )
+                time.sleep(sleep_s)
+                continue
+            # Retry on transient 5xx
+            if resp.status_code in {500, 502, 503, 504, 520}:
+                resp.close()
+                resp = None
+                if attempt >= max_retries:
+                    break
+                sleep_s = 1.5 * (2**attempt)
+                logger.warning(
+                    f"{last_status} for {url}; retrying in {sleep_s:.1f}s (attempt {attempt + 1}/{max_retries + 1})"
+                )
+                time.sleep(sleep_s)
+                continue
+            resp.raise_for_status()
+            break
+        except Exception as e:  # noqa: BLE001
+            last_err = e
+            if resp is not None:
+                resp.close()
+            # final attempt falls through
+            if attempt >= max_retries:
+                resp = None
+                break
+            sleep_s = 1.0 * (2**attempt)
+            logger.warning(
+                f"Fetch failed for {url}: {e}; retrying in {sleep_s:.1f}s (attempt {attempt + 1}/{max_retries + 1})"
+            )
+            time.sleep(sleep_s)
+    return resp, last_err, last_status
+
+
+def _is_html_content_type(content_type: Optional[str]) -> bool:
+    content_type = (content_type or "").lower()
+    return (
+        "text/html" in content_type
+        or "application/xhtml+xml" in content_type
+        or content_type == ""
+    )
+
+
+def _read_capped(resp: requests.Response, limit: int) -> bytes:
+    """Read at most ~limit bytes of a streamed response body, then release the connection."""
+    chunks: List[bytes] = []
+    total = 0
+    try:
+        for chunk in resp.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            total += len(chunk)
+            if total >= limit:
+                break
+    finally:
+        resp.close()
+    return b"".join(chunks)
+
+
+def _record_failure(
+    failed_urls: Optional[List[dict]],
+    url: str,
+    last_err: Optional[Exception],
+    status_code: Optional[int],
+) -> None:
+    # 404 和重试用尽的 429/5xx 没有异常，只有状态码
+    error = str(last_err) if last_err is not None else f"HTTP {status_code}"
+    logger.warning(f"Crawler failed to fetch {url}: {error}")
+    # Record failed URL for later export/analysis
+    if failed_urls is None:
+        return
+    failed_urls.append(
+        {
+            "url": url,
+            "error": error,
+            "status_code": status_code,
+        }
+    )
 
 
 def crawl_site(
@@ -144,12 +364,18 @@ def crawl_site(
     request_delay_s: float = 0.25,
     max_retries: int = 4,
     failed_urls: Optional[List[dict]] = None,
+    concurrency: int = 8,
+    per_host_concurrency: int = 4,
 ) -> List[str]:
     """
     Very simple same-domain crawler for sites without sitemap.xml.
     - BFS from start_url up to max_depth
     - Only keeps URLs on the same domain
     - Limits total collected URLs to max_urls
+    - Fetches up to `concurrency` pages at a time (at most `per_host_concurrency`
+      in flight per host); the frontier is still popped in priority order
+    - In polite mode each host gets one request at a time, so request_delay_s and
+      429/5xx backoff pace the whole host, not each worker thread
 
     Args:
         failed_urls: Optional list to record failed URLs with error info.
@@ -167,188 +393,159 @@ def crawl_site(
         "Accept", "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
     )
 
-    start_url = normalize_url(urldefrag(start_url)[0])
+    start_url = normalize_url(start_url.partition("#")[0])
+
+    # 解析 / 优先级缓存只属于本次爬取：随调用创建、随调用释放（异常退出也一样），并发的其它爬取互不影响
+    parsed = lru_cache(maxsize=_URL_CACHE_SIZE)(_parsed)
+    path_priority = lru_cache(maxsize=_URL_CACHE_SIZE)(_path_priority)
+
+    # Priority frontier: higher priority first, FIFO within the same priority
+    queue = _Frontier()
+    queue.push(start_url, 0, path_priority(parsed(start_url)[2]))
+    # 已入队过的 URL：导航栏 / 页脚链接会被几乎每个页面重复发现，只需入队一次
+    # （URL 的优先级固定，最早入队的那一份总是先出队，去重不改变爬取顺序）
+    queued: Set[str] = {start_url}
 
-    # Use priority queue: (priority, counter, url, depth)
-    # Priority: lower number = higher priority (heapq is min-heap)
-    # Counter ensures stable sorting for same-priority items
-    counter = 0
-    start_priority = _get_url_priority(start_url)
-    queue: List[Tuple[int, int, str, int]] = []
-    heapq.heappush(queue, (-start_priority, counter, start_url, 0))
-    counter += 1
+    concurrency = max(1, concurrency)
+    # 礼貌模式下同一 host 串行请求：请求间隔和 429/5xx 退避都在 host 槽位内执行，对整个 host 生效
+    per_host_concurrency = 1 if polite else max(1, per_host_concurrency)
 
     logger.info(
         f"Starting crawl from {start_url} "
         f"(max_depth={max_depth}, max_urls={max_urls}, "
-        f"allowed_hosts={len(allowed_hosts)}, polite={polite})"
+        f"allowed_hosts={len(allowed_hosts)}, polite={polite}, "
+        f"concurrency={concurrency})"
     )
 
     # Dynamic allowed hosts set when auto-subdomain is enabled
-    dynamic_allowed_hosts: Set[str] = set(h.lower() for h in allowed_hosts if h)
-
-    iteration = 0
-    while queue and len(results) < max_urls:
-        _, _, current, depth = heapq.heappop(queue)
-
-        # 定期报告进度
-        iteration += 1
-        if iteration % 10 == 0:
-            logger.info(
-                f"Crawl progress: visited={len(visited)}, "
-                f"queued={len(queue)}, results={len(results)}, depth={depth}"
+    dynamic_allowed_hosts: Set[str] = {sys.intern(h.lower()) for h in allowed_hosts if h}
+
+    # 每个 host 同时在途的请求数上限，保持对单个站点的礼貌
+    host_slots: Dict[str, threading.BoundedSemaphore] = {}
+
+    def _fetch(url: str, host: str, want_links: bool):
+        with host_slots[host]:
+            resp, last_err, status_code = _fetch_with_retries(
+                session,
+                url,
+                polite=polite,
+                request_delay_s=request_delay_s,
+                max_retries=max_retries,
             )
+            # 只看响应头就能判断的页面（非 HTML，或已到最大深度无需解析链接）不下载正文
+            body = None
+            if resp is not None:
+                if want_links and _is_html_content_type(resp.headers.get("Content-Type")):
+                    body = _read_capped(resp, _MAX_LINK_SCAN_BYTES)
+                else:
+                    resp.close()
+            return resp, body, last_err, status_code
 
-        if current in visited:
-            continue
-        visited.add(current)
-
-        current_parsed = urlparse(current)
-        current_host = (current_parsed.netloc or "").lower()
-
-        if not _is_allowed_domain(current, dynamic_allowed_hosts):
-            # If enabled, allow same-root subdomains discovered during crawling
-            if (
-                allow_same_root_subdomains
-                and root_domain
-                and is_same_root_domain(current_host, root_domain)
-            ):
-                dynamic_allowed_hosts.add(current_host)
-            else:
-                continue
-
-        # Skip obvious binary/static assets
-        if should_skip_by_extension(current):
-            continue
-
-        # Polite crawling: delay + retry/backoff for 429/5xx
-        last_err: Exception | None = None
-        resp = None
-        for attempt in range(max_retries + 1):
-            try:
-                if polite and request_delay_s > 0:
-                    time.sleep(request_delay_s)
-                resp = session.get(current, timeout=20)
-                # 对 404 直接放弃，不做指数重试，避免在明显死链上浪费大量时间
-                if resp.status_code == 404:
-                    logger.warning(
-                        f"404 Not Found for {current}; skipping retries "
-                        f"(attempt {attempt + 1}/{max_retries + 1})"
-                    )
-                    resp = None
-                    break
-                # Handle 429 with backoff / Retry-After
-                if resp.status_code == 429:
-                    retry_after = resp.headers.get("Retry-After")
-                    sleep_s = 2.0 * (2**attempt)
-                    if retry_after:
-                        try:
-                            sleep_s = max(sleep_s, float(retry_after))
-                        except Exception:
-                            pass
-                    logger.warning(
-                        f"429 Too Many Requests for {current}; backing off {sleep_s:.1f}s (attempt {attempt + 1}/{max_retries + 1})"
+    iteration = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        while queue and len(results) < max_urls:
+            # 按优先级取出一批待抓取的 URL（批大小不超过剩余配额）
+            batch: List[Tuple[str, int, str]] = []
+            batch_size = min(concurrency, max_urls - len(results))
+            while queue and len(batch) < batch_size:
+                current, depth = queue.pop()
+
+                # 定期报告进度
+                iteration += 1
+                if iteration % 10 == 0:
+                    logger.info(
+                        f"Crawl progress: visited={len(visited)}, "
+                        f"queued={len(queue)}, results={len(results)}, depth={depth}"
                     )
-                    time.sleep(sleep_s)
+
+                if current in visited:
                     continue
-                # Retry on transient 5xx
-                if resp.status_code in {500, 502, 503, 504, 520}:
-                    sleep_s = 1.5 * (2**attempt)
-                    logger.warning(
-                        f"{resp.status_code} for {current}; retrying in {sleep_s:.1f}s (attempt {attempt + 1}/{max_retries + 1})"
-                    )
-                    time.sleep(sleep_s)
+                visited.add(current)
+
+                _, current_host, current_path = parsed(current)
+
+                if not _host_allowed(current_host, dynamic_allowed_hosts):
+                    # If enabled, allow same-root subdomains discovered during crawling
+                    if (
+                        allow_same_root_subdomains
+                        and root_domain
+                        and is_same_root_domain(current_host, root_domain)
+                    ):
+                        dynamic_allowed_hosts.add(current_host)
+                    else:
+                        continue
+
+                # Skip obvious binary/static assets
+                if path_has_skipped_extension(current_path):
                     continue
-                resp.raise_for_status()
-                break
-            except Exception as e:  # noqa: BLE001
-                last_err = e
-                # final attempt falls through
-                if attempt >= max_retries:
-                    resp = None
-                    break
-                sleep_s = 1.0 * (2**attempt)
-                logger.warning(
-                    f"Fetch failed for {current}: {e}; retrying in {sleep_s:.1f}s (attempt {attempt + 1}/{max_retries + 1})"
-                )
-                time.sleep(sleep_s)
 
-        if resp is None:
-            logger.warning(f"Crawler failed to fetch {current}: {last_err}")
-            # Record failed URL for later export/analysis
-            if failed_urls is not None:
-                status_code = None
-                error_msg = str(last_err)
-                # Try to extract status code from error message
-                if "404" in error_msg:
-                    status_code = 404
-                elif "403" in error_msg:
-                    status_code = 403
-                elif "500" in error_msg:
-                    status_code = 500
-                elif "502" in error_msg:
-                    status_code = 502
-                elif "503" in error_msg:
-                    status_code = 503
-                failed_urls.append(
-                    {
-                        "url": current,
-                        "error": error_msg,
-                        "status_code": status_code,
-                    }
-                )
-            continue
+                if current_host not in host_slots:
+                    host_slots[current_host] = threading.BoundedSemaphore(
+                        per_host_concurrency
+                    )
+                batch.append((current, depth, current_host))
 
-        # Only include HTML-ish pages in results (avoid PDFs etc.)
-        content_type = (resp.headers.get("Content-Type") or "").lower()
-        if (
-            "text/html" in content_type
-            or "application/xhtml+xml" in content_type
-            or content_type == ""
-        ):
-            results.append(current)
-        else:
-            # Non-HTML content: don't parse and don't include as a page entry
-            continue
-        if depth >= max_depth:
-            continue
+            if not batch:
+                continue
 
-        # Parse links
-        parser = _LinkExtractor()
-        try:
-            parser.feed(resp.text)
-        except Exception as e:  # noqa: BLE001
-            logger.warning(f"Crawler failed to parse HTML at {current}: {e}")
-            continue
+            futures = [
+                pool.submit(_fetch, url, host, depth < max_depth) for url, depth, host in batch
+            ]
 
-        # 记录从当前页面提取的链接数
-        logger.debug(f"Extracted {len(parser.links)} links from {current}")
+            # 按出队顺序处理结果，保证结果顺序与优先级一致
+            for (current, depth, _), future in zip(batch, futures):
+                resp, body, last_err, status_code = future.result()
+                if resp is None:
+                    _record_failure(failed_urls, current, last_err, status_code)
+                    continue
 
-        for href in parser.links:
-            abs_url = urljoin(current, href)
-            abs_url = normalize_url(urldefrag(abs_url)[0])
-            if should_skip_by_extension(abs_url):
-                continue
+                if len(results) >= max_urls:
+                    continue
 
-            # Update allowed hosts dynamically if subdomain discovery enabled
-            host = (urlparse(abs_url).netloc or "").lower()
-            if (
-                allow_same_root_subdomains
-                and root_domain
-                and is_same_root_domain(host, root_domain)
-            ):
-                dynamic_allowed_hosts.add(host)
-
-            if abs_url not in visited and _is_allowed_domain(
-                abs_url, dynamic_allowed_hosts
-            ):
-                # Only add to queue if we haven't reached the limit yet
-                # But allow processing existing queue items even after limit is reached
-                if len(results) < max_urls:
-                    # Calculate priority for the new URL
-                    priority = _get_url_priority(abs_url)
-                    heapq.heappush(queue, (-priority, counter, abs_url, depth + 1))
-                    counter += 1
+                # Only include HTML-ish pages in results (avoid PDFs etc.)
+                if _is_html_content_type(resp.headers.get("Content-Type")):
+                    results.append(current)
+                else:
+                    # Non-HTML content: don't parse and don't include as a page entry
+                    continue
+                if body is None:
+                    continue
+
+                # Parse links
+                try:
+                    links = _extract_links(body)
+                except Exception as e:  # noqa: BLE001
+                    logger.warning(f"Crawler failed to parse HTML at {current}: {e}")
+                    continue
+
+                # 记录从当前页面提取的链接数
+                logger.debug(f"Extracted {len(links)} links from {current}")
+
+                # 当前页的 origin 只解析一次，每个链接规范化后也只解析一次
+                scheme, netloc, _ = parsed(current)
+                origin = f"{scheme}://{netloc}"
+                for href in links:
+                    abs_url = normalize_url(_join_href(current, origin, href))
+                    _, host, path_l = parsed(abs_url)
+                    if path_has_skipped_extension(path_l):
+                        continue
+
+                    # Update allowed hosts dynamically if subdomain discovery enabled
+                    if (
+                        allow_same_root_subdomains
+                        and root_domain
+                        and is_same_root_domain(host, root_domain)
+                    ):
+                        dynamic_allowed_hosts.add(host)
+
+                    if abs_url not in queued and _host_allowed(host, dynamic_allowed_hosts):
+                        # Only add to queue if we haven't reached the limit yet
+                        # But allow processing existing queue items even after limit is reached
+                        if len(results) < max_urls:
+                            # Calculate priority for the new URL
+                            priority = path_priority(path_l)
+                            queue.push(abs_url, depth + 1, priority)
+                            queued.add(abs_url)
 
     # 爬取完成后的总结
     logger.info(
@@ -360,5 +557,4 @@ def crawl_site(
         logger.info(f"Crawl stopped: reached max_urls limit ({max_urls})")
     elif not queue:
         logger.info("Crawl stopped: queue exhausted (all reachable pages visited)")
-
     return results
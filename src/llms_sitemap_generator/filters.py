@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import List, Optional
+from functools import lru_cache
+from itertools import repeat
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 from urllib.parse import urlparse
 
-from .config import AppConfig, FilterRule
+from .config import _DATACLASS_OPTS, AppConfig, FilterRule
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class PageEntry:
     url: str
     path: str
@@ -18,10 +22,25 @@ class PageEntry:
 
 
 def _relative_path(base_url: str, url: str) -> str:
-    base = urlparse(base_url)
-    u = urlparse(url)
-    path = u.path or "/"
-    return path
+    """
+    Return the path of url (or "/"), same as urlparse(url).path or "/".
+
+    常见的 http(s) 绝对 URL 直接切片取路径；带 ;params 或控制字符等少见情况仍交给 urlparse。
+    """
+    if url.startswith(("https://", "http://")) and ";" not in url and url.isprintable():
+        rest = url[url.index("://") + 3 :]
+        end = len(rest)
+        for ch in "?#":
+            i = rest.find(ch)
+            if i != -1 and i < end:
+                end = i
+        slash = rest.find("/", 0, end)
+        return rest[slash:end] if slash != -1 else "/"
+    return urlparse(url).path or "/"
+
+
+_LANG_SEGMENT_RE = re.compile(r"/([a-z]{2})(?:[-_][a-zA-Z]{2})?/")
+_LANG_CODE_RE = re.compile(r"^[a-z]{2}(?:[-_][a-zA-Z]{2})?$")
 
 
 def _detect_language_prefix(path: str) -> Optional[str]:
@@ -32,22 +51,122 @@ def _detect_language_prefix(path: str) -> Optional[str]:
     - "/zh-cn/blog/..." -> "zh"
     Only used to distinguish default language prefix, not strict i18n parsing.
     """
-    # First try to match at the beginning of the path
-    m = re.match(r"^/([a-z]{2})(?:[-_][a-zA-Z]{2})?/", path)
-    if m:
-        return m.group(1).lower()
-
-    # Also search for language codes anywhere in the path
-    # This handles cases like /doc/zh-hk/page or /help/en-us/article
-    m = re.search(r"/([a-z]{2})(?:[-_][a-zA-Z]{2})?/", path)
+    # Search for a language code segment; a match at the beginning of the path is
+    # found first. This also handles cases like /doc/zh-hk/page or /help/en-us/article
+    m = _LANG_SEGMENT_RE.search(path)
     if m:
         return m.group(1).lower()
 
     return None
 
 
+def _rule_regex(rule: FilterRule) -> "re.Pattern[str]":
+    return rule.compiled if rule.compiled is not None else re.compile(rule.pattern)
+
+
 def _match_rule(path: str, rule: FilterRule) -> bool:
-    return re.search(rule.pattern, path) is not None
+    return _rule_regex(rule).search(path) is not None
+
+
+_DEFAULT_REGEX_FLAGS = re.compile("").flags
+
+
+def _combinable(regexes: Sequence["re.Pattern[str]"]) -> bool:
+    # 含捕获组（合并后编号错位，如 \1 反向引用）或内联全局标志（如 (?i)，合并后会作用于所有规则）的
+    # 规则无法安全合并，这类情况保留逐条匹配
+    return all(rx.groups == 0 and rx.flags == _DEFAULT_REGEX_FLAGS for rx in regexes)
+
+
+def _any_matcher(regexes: Sequence["re.Pattern[str]"]) -> Callable[[str], bool]:
+    """
+    Return a predicate equivalent to `any(rx.search(path) for rx in regexes)`.
+
+    多条规则合并为一个 `(?:p1)|(?:p2)|...` 正则，一次 search 完成匹配。
+    """
+    if not regexes:
+        return lambda path: False
+    if _combinable(regexes):
+        try:
+            combined = re.compile("|".join(f"(?:{rx.pattern})" for rx in regexes))
+        except re.error:
+            pass
+        else:
+            return lambda path: combined.search(path) is not None
+    return lambda path: any(rx.search(path) is not None for rx in regexes)
+
+
+def _first_matcher(regexes: Sequence["re.Pattern[str]"]) -> Callable[[str], Optional[int]]:
+    """
+    Return a function giving the index of the first regex that matches anywhere in path.
+
+    单纯的交替匹配返回的是「最靠左的匹配」而非「第一条命中的规则」，
+    因此每条规则包在一个从路径开头向后扫描的前瞻里，并带一个空的命名组标记规则序号，按规则顺序尝试。
+    """
+    if not regexes:
+        return lambda path: None
+    if _combinable(regexes):
+        try:
+            combined = re.compile(
+                "|".join(
+                    f"(?=[\\s\\S]*?(?:{rx.pattern}))(?P<r{i}>)"
+                    for i, rx in enumerate(regexes)
+                )
+            )
+        except re.error:
+            pass
+        else:
+
+            def first(path: str) -> Optional[int]:
+                m = combined.match(path)
+                return int(m.lastgroup[1:]) if m else None
+
+            return first
+
+    def first_sequential(path: str) -> Optional[int]:
+        for i, rx in enumerate(regexes):
+            if rx.search(path) is not None:
+                return i
+        return None
+
+    return first_sequential
+
+
+# 路径首段 -> 分组名（扩展了常见 B2B SaaS 站点分类）；同一段出现在多个分组时以先列出的为准
+_SEGMENT_GROUPS = (
+    (("blog", "blogs", "article", "articles", "post", "posts"), "Blog"),
+    (
+        (
+            "doc",
+            "docs",
+            "documentation",
+            "help",
+            "guide",
+            "guides",
+            "developers",
+            "developer",
+        ),
+        "Docs",
+    ),
+    (("product", "products", "solution", "solutions"), "Products"),
+    (("pricing", "price", "prices", "plan", "plans"), "Pricing"),
+    (("about", "about-us", "company"), "About"),
+    (("contact", "support", "help"), "Support"),
+    (("case", "cases", "use-case", "use-cases"), "Use Cases"),
+    (("integration", "integrations", "resource", "resources"), "Integrations"),
+    (("location", "locations", "proxy-location", "proxy-locations"), "Proxy Locations"),
+    (("legal", "privacy", "terms", "policy", "policies"), "Legal"),
+    (("career", "careers", "jobs", "hiring"), "Careers"),
+    (("press", "news", "newsroom", "media"), "Press"),
+    (("affiliate", "affiliates", "partner", "partners"), "Partners"),
+    (("dataset", "datasets", "data"), "Datasets"),
+    (("serp", "search"), "SERP"),
+    (("scraper", "scrapers", "scraping"), "Scrapers"),
+    (("proxy", "proxies"), "Proxies"),
+)
+# 倒序构建，使先列出的分组覆盖后面的（如 "help" 归入 Docs）
+_GROUP_BY_SEGMENT: Dict[str, str] = {
+    segment: group for segments, group in reversed(_SEGMENT_GROUPS) for segment in segments
+}
 
 
 def _auto_group_from_path(path: str) -> str:
@@ -58,111 +177,71 @@ def _auto_group_from_path(path: str) -> str:
     """
     if path == "/":
         return "Home"
-    segments = [seg for seg in path.split("/") if seg]
-    if not segments:
+    # 只取前两个非空路径段，无需切分整条路径
+    first, _, rest = path.lstrip("/").partition("/")
+    if not first:
         return "Other"
-    
+    second = rest.lstrip("/").partition("/")[0]
+
     # Check if first segment is a language code (2-letter code, optionally followed by -xx)
-    first = segments[0].lower()
-    lang_match = re.match(r"^[a-z]{2}(?:[-_][a-zA-Z]{2})?$", first)
-    
+    first = first.lower()
+
     # If first segment is a language code, use the second segment for grouping
-    if lang_match and len(segments) > 1:
-        first = segments[1].lower()
-    else:
-        first = segments[0].lower()
+    if second and _LANG_CODE_RE.match(first):
+        first = second.lower()
 
     # Special handling for common paths (extended to match more B2B SaaS site categories)
-    if first in ("blog", "blogs", "article", "articles", "post", "posts"):
-        return "Blog"
-    elif first in (
-        "doc",
-        "docs",
-        "documentation",
-        "help",
-        "guide",
-        "guides",
-        "developers",
-        "developer",
-    ):
-        return "Docs"
-    elif first in ("product", "products", "solution", "solutions"):
-        return "Products"
-    elif first in ("pricing", "price", "prices", "plan", "plans"):
-        return "Pricing"
-    elif first in ("about", "about-us", "company"):
-        return "About"
-    elif first in ("contact", "support", "help"):
-        return "Support"
-    elif first in ("case", "cases", "use-case", "use-cases"):
-        return "Use Cases"
-    elif first in ("integration", "integrations", "resource", "resources"):
-        return "Integrations"
-    elif first in ("location", "locations", "proxy-location", "proxy-locations"):
-        return "Proxy Locations"
-    elif first in ("legal", "privacy", "terms", "policy", "policies"):
-        return "Legal"
-    elif first in ("career", "careers", "jobs", "hiring"):
-        return "Careers"
-    elif first in ("press", "news", "newsroom", "media"):
-        return "Press"
-    elif first in ("affiliate", "affiliates", "partner", "partners"):
-        return "Partners"
-    elif first in ("dataset", "datasets", "data"):
-        return "Datasets"
-    elif first in ("serp", "search"):
-        return "SERP"
-    elif first in ("scraper", "scrapers", "scraping"):
-        return "Scrapers"
-    elif first in ("proxy", "proxies"):
-        return "Proxies"
+    special = _GROUP_BY_SEGMENT.get(first)
+    if special is not None:
+        return special
 
     # simple normalization: replace "-" with space and title-case
     name = first.replace("-", " ").strip().title()
     return name or "Other"
 
 
+_GROUP_WEIGHTS: Dict[str, int] = {
+    "home": 40,
+    "products": 35,
+    "product": 35,
+    "pricing": 30,
+    "docs": 28,
+    "documentation": 28,
+    "proxies": 27,
+    "proxy": 27,
+    "scrapers": 26,
+    "scraper": 26,
+    "scraping": 26,
+    "blog": 25,
+    "blogs": 25,
+    "serp": 24,
+    "use cases": 24,
+    "usecases": 24,
+    "integrations": 24,
+    "integration": 24,
+    "datasets": 23,
+    "dataset": 23,
+    "proxy locations": 22,
+    "locations": 22,
+    "about": 20,
+    "about us": 20,
+    "partners": 19,
+    "affiliates": 19,
+    "legal": 18,
+    "press": 17,
+    "news": 17,
+    "careers": 15,
+}
+
+
+# 分组名种类很少但每个 URL 都要查一次，缓存整个查询（含 lower()）
+@lru_cache(maxsize=4096)
 def _base_group_weight(group: str) -> int:
     """
     Heuristic weight for groups, used in scoring when no explicit priority is set.
     Enhanced to match B2B SaaS site prioritization.
     """
-    key = group.lower()
-    if key == "home":
-        return 40
-    if key in {"products", "product"}:
-        return 35
-    if key in {"pricing"}:
-        return 30
-    if key in {"docs", "documentation"}:
-        return 28
-    if key in {"proxies", "proxy"}:
-        return 27
-    if key in {"scrapers", "scraper", "scraping"}:
-        return 26
-    if key in {"blog", "blogs"}:
-        return 25
-    if key in {"serp"}:
-        return 24
-    if key in {"use cases", "usecases"}:
-        return 24
-    if key in {"integrations", "integration"}:
-        return 24
-    if key in {"datasets", "dataset"}:
-        return 23
-    if key in {"proxy locations", "locations"}:
-        return 22
-    if key in {"about", "about us"}:
-        return 20
-    if key in {"partners", "affiliates"}:
-        return 19
-    if key in {"legal"}:
-        return 18
-    if key in {"press", "news"}:
-        return 17
-    if key in {"careers"}:
-        return 15
-    return 10
+    return _GROUP_WEIGHTS.get(group.lower(), 10)
 
 
 def _compute_score(group: str, priority: int, path: str) -> int:
@@ -188,6 +267,7 @@ def _compute_score(group: str, priority: int, path: str) -> int:
     return max(0, min(200, score))  # Increased max score to 200
 
 
+@lru_cache(maxsize=None)
 def _default_exclude_rules() -> List[FilterRule]:
     """
     Built-in common exclude rules to avoid including obvious noise pages
@@ -211,69 +291,107 @@ def _default_exclude_rules() -> List[FilterRule]:
         r"\.rss$",
         r"/404",
     ]
-    return [FilterRule(pattern=p) for p in patterns]
+    # 结果被缓存复用，规则在这里一次性预编译
+    return [FilterRule(pattern=p, compiled=re.compile(p)) for p in patterns]
+
+
+# 低于该 URL 数量时单进程处理，进程池的启动开销（Windows 上为 spawn）得不偿失
+_PARALLEL_MIN_URLS = 50_000
 
 
 def filter_and_group_urls(config: AppConfig, urls: List[str]) -> List[PageEntry]:
+    workers = os.cpu_count() or 1
+    if len(urls) < _PARALLEL_MIN_URLS or workers < 2:
+        results, sort_keys = _filter_chunk(config, urls)
+    else:
+        results, sort_keys = _filter_parallel(config, urls, workers)
+
+    # Sort by group then score (desc) then path (stable, same order as sorting the entries directly)
+    order = sorted(range(len(results)), key=sort_keys.__getitem__)
+    return [results[i] for i in order]
+
+
+def _filter_parallel(
+    config: AppConfig, urls: List[str], workers: int
+) -> Tuple[List[PageEntry], List[Tuple[str, int, str]]]:
+    """
+    Filter contiguous slices of urls in a process pool.
+    Slices are merged back in input order so ties in the final stable sort resolve the same
+    way as the single-process path.
+    """
+    size = -(-len(urls) // workers)
+    chunks = [urls[i : i + size] for i in range(0, len(urls), size)]
+    try:
+        with ProcessPoolExecutor(max_workers=len(chunks)) as ex:
+            parts = list(ex.map(_filter_chunk, repeat(config), chunks))
+    except Exception:  # noqa: BLE001 - e.g. no fork/spawn allowed in a sandbox; fall back to one process
+        return _filter_chunk(config, urls)
+    results: List[PageEntry] = []
+    sort_keys: List[Tuple[str, int, str]] = []
+    for part_results, part_keys in parts:
+        results.extend(part_results)
+        sort_keys.extend(part_keys)
+    return results, sort_keys
+
+
+def _filter_chunk(
+    config: AppConfig, urls: List[str]
+) -> Tuple[List[PageEntry], List[Tuple[str, int, str]]]:
+    """Filter and group urls; returns entries in input order plus their sort keys."""
     include_rules = config.filters.include
     exclude_rules = list(config.filters.exclude)
     if config.filters.use_default_excludes:
         exclude_rules = _default_exclude_rules() + exclude_rules
     auto_group = config.filters.auto_group
+    auto_filter_languages = config.filters.auto_filter_languages
+    base_url = config.site.base_url
 
     results: List[PageEntry] = []
+    # 排序键在构造条目时顺手生成：(group, -score, path)
+    sort_keys: List[Tuple[str, int, str]] = []
     default_lang = (config.site.default_language or "en").lower()
 
+    # 每类规则合并为单个正则，循环内每个 URL 只做一次匹配
+    include_regexes = [_rule_regex(r) for r in include_rules]
+    exclude_regexes = [_rule_regex(r) for r in exclude_rules]
+    first_include = _first_matcher(include_regexes)
+    any_exclude = _any_matcher(exclude_regexes)
+    # include 命中时只有「精确」exclude 规则（^...$）仍然生效
+    any_strict_exclude = _any_matcher(
+        [
+            rx
+            for rx, r in zip(exclude_regexes, exclude_rules)
+            if r.pattern.startswith("^") and r.pattern.endswith("$")
+        ]
+    )
+
     for u in urls:
-        path = _relative_path(config.site.base_url, u)
+        path = _relative_path(base_url, u)
 
         # If auto language filtering is enabled and path has language prefix that's not default language, skip
-        if config.filters.auto_filter_languages:
+        if auto_filter_languages:
             lang_prefix = _detect_language_prefix(path)
             if lang_prefix and lang_prefix != default_lang:
                 continue
 
-        # Exclude first - but if include rule matches, prioritize keeping it
-        excluded = False
-        if exclude_rules:
-            # First check if any include rule matches
-            has_include_match = any(_match_rule(path, r) for r in include_rules)
-            # If include matches, exclude rules need to be stricter (exact path match)
-            # If no include matches, use normal exclude rules
-            if has_include_match:
-                # For include matches, only exclude exact matching exclude rules
-                excluded = any(
-                    _match_rule(path, r)
-                    and (r.pattern.startswith("^") and r.pattern.endswith("$"))
-                    for r in exclude_rules
-                )
-            else:
-                excluded = any(_match_rule(path, r) for r in exclude_rules)
+        # Include rules determine group/priority; the first match wins
+        include_index = first_include(path)
+        matched_rule = include_rules[include_index] if include_index is not None else None
 
-        if excluded:
+        # Exclude - but if include rule matches, only exact exclude rules apply
+        is_excluded = any_strict_exclude if matched_rule is not None else any_exclude
+        if is_excluded(path):
             continue
 
-        # Include rules determine group/priority; if none match, optionally auto-group
-        matched_rule: Optional[FilterRule] = None
-        for r in include_rules:
-            if _match_rule(path, r):
-                matched_rule = r
-                break
-
         if matched_rule:
             group = matched_rule.group if matched_rule.group else "Other"
             priority = matched_rule.priority
         else:
             # Improved auto-grouping: consider subdomain and path
             if auto_group:
-                # Extract subdomain info from URL
-                from urllib.parse import urlparse
-
-                parsed = urlparse(u)
-                host = parsed.netloc.lower()
-
-                # If path is empty or only /, use domain info
+                # If path is empty or only /, use domain (subdomain) info
                 if path == "/" or not path.strip("/"):
+                    host = urlparse(u).netloc.lower()
                     if "blog" in host or "/blog" in path:
                         group = "Blog"
                     elif "doc" in host or "developer" in host or "developers" in host:
@@ -290,7 +408,6 @@ def filter_and_group_urls(config: AppConfig, urls: List[str]) -> List[PageEntry]
         results.append(
             PageEntry(url=u, path=path, group=group, priority=priority, score=score)
         )
+        sort_keys.append((group, -score, path))
 
-    # Sort by group then score (desc) then path
-    results.sort(key=lambda p: (p.group, -p.score, p.path))
-    return results
+    return results, sort_keys
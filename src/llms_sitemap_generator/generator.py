@@ -1,25 +1,48 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import heapq
+import json
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-import json
 import requests
 from urllib.parse import urlparse
 
-from .config import AppConfig
-from .filters import PageEntry, filter_and_group_urls, _base_group_weight
-from .html_summary import fetch_basic_summary
-from .sitemap import collect_urls_from_sources, write_sitemap_xml
+from .config import _DATACLASS_OPTS, AppConfig, FetchConfig, _host
+from .filters import PageEntry, filter_and_group_urls, _base_group_weight, _relative_path
+from . import html_summary
+from .html_summary import afetch_basic_summary, fetch_basic_summary
+from .http_session import create_session
+from .summary_cache import SummaryCache, open_summary_cache
+from .sitemap import _write_loc_xml, collect_urls_from_sources, write_sitemap_xml
 from .logger import get_logger
 
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - orjson 是可选依赖
+    _orjson = None
+
 logger = get_logger(__name__)
 
 
-@dataclass
+def _dumps_json(obj: Any) -> bytes:
+    """
+    Serialize obj to indented UTF-8 JSON bytes.
+
+    有 orjson 时走 C 实现，否则回退到标准库 json；两者输出一致（2 空格缩进、保留非 ASCII 字符、保持键顺序）。
+    """
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+@dataclass(**_DATACLASS_OPTS)
 class RenderedPage:
     url: str
     group: str
@@ -29,15 +52,27 @@ class RenderedPage:
     description: str
 
 
+@lru_cache(maxsize=65536)
+def _host_and_path(url: str) -> Tuple[str, str]:
+    """
+    (lower-cased netloc, path or "/") of url, same as urlparse.
+    llms.txt 去重和 sitemap_index 按主机拆分会解析同一批 URL，缓存后每个 URL 只解析一次；
+    常见的 http(s) URL 直接切片，少见写法（;params、控制字符等）仍交给 urlparse。
+    """
+    if url.startswith(("https://", "http://")) and ";" not in url and url.isprintable():
+        return _host(url), _relative_path("", url)
+    parsed = urlparse(url)
+    return parsed.netloc.lower(), parsed.path or "/"
+
+
 def _print_summary(pages: List[PageEntry]) -> None:
     total = len(pages)
     logger.info(f"Total pages after filtering: {total}")
 
-    by_group: dict[str, int] = defaultdict(int)
-    for p in pages:
-        by_group[p.group] += 1
+    by_group = Counter(map(attrgetter("group"), pages))
 
     logger.info("Pages by group:")
+    # most_common() breaks ties by insertion order; keep the explicit (count desc, name) order
     for group, count in sorted(by_group.items(), key=lambda x: (-x[1], x[0])):
         logger.info(f"  - {group}: {count}")
 
@@ -47,6 +82,71 @@ def _print_summary(pages: List[PageEntry]) -> None:
         logger.info(f"  [{p.group}] {p.url}")
 
 
+def _make_session(config: AppConfig) -> requests.Session:
+    """Pooled session for one generate run, with enough keep-alive connections for fetch.concurrency."""
+    session = create_session(
+        pool_connections=32,
+        pool_maxsize=max(32, config.fetch.concurrency * 2),
+    )
+    if config.fetch.user_agent:
+        session.headers["User-Agent"] = config.fetch.user_agent
+    return session
+
+
+def _fetch_summaries(
+    urls: List[str], session: requests.Session, site_name: Optional[str], fetch: FetchConfig
+) -> List[Tuple[str, str]]:
+    """
+    Fetch (title, description) for each URL, in input order.
+    页面抓取是纯网络 I/O，用线程池并发请求；workers <= 1 时逐个抓取。
+    """
+    cache = open_summary_cache(fetch)
+    try:
+        if fetch.async_enabled and urls:
+            if html_summary.aiohttp is not None:
+                import asyncio
+
+                return asyncio.run(
+                    _afetch_summaries(urls, session, site_name, fetch.concurrency, cache)
+                )
+            logger.warning("fetch.async_enabled is set but aiohttp is not installed; using threads")
+
+        def _one(u: str) -> Tuple[str, str]:
+            return fetch_basic_summary(u, session, site_name=site_name, cache=cache)
+
+        workers = fetch.concurrency
+        if workers <= 1 or len(urls) <= 1:
+            return [_one(u) for u in urls]
+        with ThreadPoolExecutor(max_workers=min(workers, len(urls))) as ex:
+            return list(ex.map(_one, urls))
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+async def _afetch_summaries(
+    urls: List[str],
+    session: requests.Session,
+    site_name: Optional[str],
+    per_host: int,
+    cache: Optional[SummaryCache],
+) -> List[Tuple[str, str]]:
+    """aiohttp variant of _fetch_summaries: one event loop, per_host connections per host."""
+    import asyncio
+
+    aiohttp = html_summary.aiohttp
+    connector = aiohttp.TCPConnector(limit=64, limit_per_host=max(1, per_host), ttl_dns_cache=300)
+    async with aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=20),
+        # 沿用 requests 会话上配置的 User-Agent / Accept 等请求头
+        headers=dict(session.headers),
+    ) as client:
+        return await asyncio.gather(
+            *(afetch_basic_summary(u, client, site_name=site_name, cache=cache) for u in urls)
+        )
+
+
 def _apply_group_profile(
     config: AppConfig,
     pages: List[PageEntry],
@@ -99,7 +199,7 @@ def generate_llms_txt(
     - fetch each page and extract title/meta description
     - render grouped markdown list
     """
-    session = requests.Session()
+    session = _make_session(config)
 
     logger.info("Collecting URLs from sources...")
     urls = collect_urls_from_sources(config, session)
@@ -139,7 +239,7 @@ def generate_llms_from_urls(
     - GUI 场景已经通过 collect_urls_from_sources 收集并缓存了 URL
     - 想要跳过再次爬取 / 只在内存里重新过滤和生成输出的场景
     """
-    session = requests.Session()
+    session = _make_session(config)
     _generate_llms_from_urls(
         config,
         urls,
@@ -186,45 +286,47 @@ def _generate_llms_from_urls(
         logger.warning("No URLs left after applying group profile/selection.")
         return
 
+    # Group pages by group name (once; group limits trim these buckets in place)
+    groups: dict[str, List[PageEntry]] = defaultdict(list)
+    for p in pages:
+        groups[p.group].append(p)
+
     # Apply per-group limits based on score
     group_limits = config.filters.group_limits
     default_limit = config.filters.default_group_limit
     if group_limits or default_limit:
-        by_group: Dict[str, List[PageEntry]] = defaultdict(list)
-        for p in pages:
-            by_group[p.group].append(p)
-
-        limited_pages: List[PageEntry] = []
-        for gname, gpages in by_group.items():
+        for gname, gpages in groups.items():
             limit = group_limits.get(gname, default_limit)
             if limit is None or limit <= 0:
-                limited_pages.extend(gpages)
-                continue
-            gpages_sorted = sorted(gpages, key=lambda p: -p.score)
-            limited_pages.extend(gpages_sorted[:limit])
+                kept = gpages
+            else:
+                # 只需前 limit 个：nlargest 为 O(N log limit)，且与稳定排序后切片的结果一致
+                kept = heapq.nlargest(limit, gpages, key=attrgetter("score"))
+            groups[gname] = sorted(kept, key=lambda p: (-p.score, p.path))
 
-        pages = sorted(limited_pages, key=lambda p: (p.group, -p.score, p.path))
+        # Same order as sorting all kept pages by (group, -score, path)
+        pages = [p for gname in sorted(groups) for p in groups[gname]]
         logger.info(f"Applied group limits; {len(pages)} pages remain.")
 
     if max_pages is not None and max_pages > 0:
-        pages = pages[:max_pages]
+        if len(pages) > max_pages:
+            pages = pages[:max_pages]
+            groups = defaultdict(list)
+            for p in pages:
+                groups[p.group].append(p)
         logger.info(f"Truncated to first {len(pages)} pages due to max_pages={max_pages}.")
 
     if dry_run:
         _print_summary(pages)
         return
 
-    # Group pages by group name
-    groups: dict[str, List[PageEntry]] = defaultdict(list)
-    for p in pages:
-        groups[p.group].append(p)
-
-    lines: List[str] = []
+    # 文件头只有几行；分组与页面部分在最后直接流式写入文件，不再拼接完整的行列表
+    header_lines: List[str] = []
     rendered_pages: List[RenderedPage] = []
     
     # Title format: Simple, only show domain (clean format)
-    lines.append(f"# {config.site.base_url}")
-    lines.append("")
+    header_lines.append(f"# {config.site.base_url}")
+    header_lines.append("")
 
     # Site Overview at top (using blockquote format)
     if config.site.description:
@@ -232,13 +334,11 @@ def _generate_llms_from_urls(
         desc_lines = config.site.description.strip().split("\n")
         for line in desc_lines:
             if line.strip():
-                lines.append(f" > {line.strip()}")
-        lines.append("")
+                header_lines.append(f" > {line.strip()}")
+        header_lines.append("")
 
     # Detailed group list, avoid duplicate URLs (e.g. with/without trailing slash)
-    seen_url_keys: set[tuple[str, str, str]] = set()
-    # Used to count actual output pages per group after deduplication
-    actual_group_counts: Dict[str, int] = defaultdict(int)
+    seen_url_keys: set[tuple[str, str]] = set()
 
     def _url_key(u: str) -> tuple[str, str]:
         """
@@ -247,9 +347,7 @@ def _generate_llms_from_urls(
         - Ignore fragment
         - Strip trailing slash (except root)
         """
-        parsed = urlparse(u)
-        host = parsed.netloc.lower()
-        path = parsed.path or "/"
+        host, path = _host_and_path(u)
         if path != "/" and path.endswith("/"):
             path = path.rstrip("/")
         return host, path
@@ -257,61 +355,76 @@ def _generate_llms_from_urls(
     def _group_sort_key(name: str) -> tuple[int, str]:
         return (-_base_group_weight(name), name)
 
-    # First pass: count actual numbers after deduplication
-    for group_name in sorted(groups.keys(), key=_group_sort_key):
+    # First pass: deduplicate once, keeping the pages to output per group (in output order)
+    group_names = sorted(groups.keys(), key=_group_sort_key)
+    unique_pages: Dict[str, List[PageEntry]] = {}
+    for group_name in group_names:
+        kept = unique_pages[group_name] = []
         for p in groups[group_name]:
             key = _url_key(p.url)
             if key not in seen_url_keys:
                 seen_url_keys.add(key)
-                actual_group_counts[group_name] += 1
-
-    # Clear seen_url_keys, prepare for actual output
-    seen_url_keys.clear()
+                kept.append(p)
+
+    # Fetch all page summaries up front (concurrently), then render in order
+    summaries: Dict[str, Tuple[str, str]] = {}
+    if fetch_content:
+        # Extract site name from base URL for description generation
+        base_parsed = urlparse(config.site.base_url)
+        site_name = base_parsed.netloc.replace("www.", "").split(".")[0].title() if base_parsed.netloc else None
+        fetch_urls = [p.url for kept in unique_pages.values() for p in kept]
+        summaries = dict(
+            zip(
+                fetch_urls,
+                _fetch_summaries(fetch_urls, session, site_name, config.fetch),
+            )
+        )
 
     # Group statistics overview using deduplicated counts
     # Note: Groups Overview is not displayed, directly show groups (cleaner format)
-    # lines.append("## Groups Overview")
-    # lines.append("")
-    # for g in sorted(actual_group_counts.keys(), key=_group_sort_key):
-    #     lines.append(f"- {g}: {actual_group_counts[g]} pages")
-    # lines.append("")
-
-    # Detailed group list output (clean format)
-    for group_name in sorted(groups.keys(), key=_group_sort_key):
-        # Use simpler group title format
-        lines.append(f"## {group_name}")
-        lines.append("")
-        for p in groups[group_name]:
-            key = _url_key(p.url)
-            if key in seen_url_keys:
-                continue
-            seen_url_keys.add(key)
-            if fetch_content:
-                # Extract site name from base URL for description generation
-                base_parsed = urlparse(config.site.base_url)
-                site_name = base_parsed.netloc.replace("www.", "").split(".")[0].title() if base_parsed.netloc else None
-                title, desc = fetch_basic_summary(p.url, session, site_name=site_name)
-            else:
-                title = p.url
-                desc = f"Page at {p.url}"
-            lines.append(f"- [{title}]({p.url}): {desc}")
-            rendered_pages.append(
-                RenderedPage(
-                    url=p.url,
-                    group=group_name,
-                    path=p.path,
-                    score=p.score,
-                    title=title,
-                    description=desc,
-                )
-            )
-        lines.append("")
+    # （如需恢复，去重后的每组页数即 len(unique_pages[g])，无需再单独计数）
 
     # Ensure output directory exists
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text("\n".join(lines), encoding="utf-8")
+    # Output is the same as "\n".join(all lines): every line after the header starts with "\n"
+    with output_path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+        w = f.write
+        w("\n".join(header_lines))
+
+        # Detailed group list output (clean format)
+        for group_name in group_names:
+            # Use simpler group title format
+            w(f"\n## {group_name}\n")
+            for p in unique_pages[group_name]:
+                if fetch_content:
+                    title, desc = summaries[p.url]
+                else:
+                    title = p.url
+                    desc = f"Page at {p.url}"
+                w(f"\n- [{title}]({p.url}): {desc}")
+                rendered_pages.append(
+                    RenderedPage(
+                        url=p.url,
+                        group=group_name,
+                        path=p.path,
+                        score=p.score,
+                        title=title,
+                        description=desc,
+                    )
+                )
+            w("\n")
     logger.info(f"Wrote llms.txt to {output_path}")
 
+    # sitemap.xml 与 sitemap_index 都需要「全部 URL」时只收集一次：
+    # 优先复用调用方提供的 all_urls，否则首次需要时再收集并缓存
+    collected_all_urls: Optional[List[str]] = all_urls
+
+    def _all_urls() -> List[str]:
+        nonlocal collected_all_urls
+        if collected_all_urls is None:
+            collected_all_urls = collect_urls_from_sources(config, session)
+        return collected_all_urls
+
     # Optional additional outputs
     if config.output.llms_full_txt:
         full_path = Path(config.output.llms_full_txt)
@@ -337,13 +450,13 @@ def _generate_llms_from_urls(
         else:
             # 优先复用调用方提供的 all_urls，避免为生成 sitemap 再次触发完整收集/爬虫
             if all_urls is not None:
-                sitemap_urls = list(all_urls)
+                sitemap_urls = all_urls
                 logger.info(
                     f"Generating sitemap.xml with previously collected URLs "
                     f"({len(sitemap_urls)} URLs)"
                 )
             else:
-                sitemap_urls = collect_urls_from_sources(config, session)
+                sitemap_urls = _all_urls()
                 logger.info(
                     "Generating sitemap.xml with all collected URLs "
                     f"({len(sitemap_urls)} URLs)"
@@ -356,10 +469,7 @@ def _generate_llms_from_urls(
         write_sitemap_xml(config, sitemap_urls, str(sitemap_path_obj))
     if config.output.sitemap_index:
         # sitemap_index should include all URLs (all languages), not just filtered ones
-        if all_urls is not None:
-            sitemap_index_urls = list(all_urls)
-        else:
-            sitemap_index_urls = collect_urls_from_sources(config, session)
+        sitemap_index_urls = _all_urls()
         index_path = Path(config.output.sitemap_index)
         # If relative path, make it relative to output_path's parent
         if not index_path.is_absolute():
@@ -380,8 +490,7 @@ def _write_sitemaps_and_index(
     """
     by_host: Dict[str, List[str]] = defaultdict(list)
     for url in urls:
-        u = urlparse(url)
-        host = (u.netloc or "").lower()
+        host = _host_and_path(url)[0]
         if not host:
             continue
         by_host[host].append(url)
@@ -395,14 +504,14 @@ def _write_sitemaps_and_index(
     base_dir = index_path.parent
 
     sitemap_entries: List[Dict[str, str]] = []
+    # 各主机的子 sitemap 互不依赖，先收集再并发写出；
+    # 文件名相同的主机（如不同域名下的 www）保持原先「后写覆盖」的结果，只写最后一个
+    sitemap_jobs: Dict[Path, List[str]] = {}
     for host, urls in sorted(by_host.items()):
         # Use subdomain prefix as filename prefix, e.g. www_sitemap.xml / doc_sitemap.xml
         sub = host.split(".")[0] if "." in host else host or "site"
         sitemap_filename = f"{sub}_sitemap.xml"
-        sitemap_path = base_dir / sitemap_filename
-
-        # Reuse basic sitemap generation logic
-        write_sitemap_xml(config, urls, str(sitemap_path))
+        sitemap_jobs[base_dir / sitemap_filename] = urls
 
         scheme = "https" if not urls else (urlparse(urls[0]).scheme or "https")
         loc = f"{scheme}://{host}/{sitemap_filename}"
@@ -412,26 +521,27 @@ def _write_sitemaps_and_index(
             }
         )
 
-    # Generate sitemap_index.xml
-    from xml.etree import ElementTree as ET  # Local import to avoid top-level dependency
-
-    root = ET.Element(
-        "sitemapindex",
-        attrib={"xmlns": "http://www.sitemaps.org/schemas/sitemap/0.9"},
-    )
+    # Reuse basic sitemap generation logic
+    if len(sitemap_jobs) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, len(sitemap_jobs))) as ex:
+            futures = [
+                ex.submit(write_sitemap_xml, config, host_urls, str(sitemap_path))
+                for sitemap_path, host_urls in sitemap_jobs.items()
+            ]
+            for future in futures:
+                future.result()
+    else:
+        for sitemap_path, host_urls in sitemap_jobs.items():
+            write_sitemap_xml(config, host_urls, str(sitemap_path))
 
+    # Generate sitemap_index.xml
     today = datetime.now(timezone.utc).date().isoformat()
-    for entry in sitemap_entries:
-        sm_el = ET.SubElement(root, "sitemap")
-        loc_el = ET.SubElement(sm_el, "loc")
-        loc_el.text = entry["loc"]
-        lastmod_el = ET.SubElement(sm_el, "lastmod")
-        lastmod_el.text = today
-
-    tree = ET.ElementTree(root)
-    index_path.write_text(
-        ET.tostring(root, encoding="utf-8", xml_declaration=True).decode("utf-8"),
-        encoding="utf-8",
+    _write_loc_xml(
+        index_path,
+        "sitemapindex",
+        "sitemap",
+        (entry["loc"] for entry in sitemap_entries),
+        lastmod=today,
     )
     logger.info(f"Wrote sitemap_index.xml to {index_path}")
 
@@ -439,23 +549,18 @@ def _write_sitemaps_and_index(
 def write_llms_full(config: AppConfig, pages: List[RenderedPage], path: Path) -> None:
     # Ensure output directory exists
     path.parent.mkdir(parents=True, exist_ok=True)
-    lines: List[str] = []
-    lines.append(f"# {config.site.base_url} llms-full.txt")
-    lines.append("# Generated by llms-sitemap-generator")
-    lines.append(f"# Default language: {config.site.default_language}")
-    lines.append("")
-
-    for idx, p in enumerate(pages, start=1):
-        lines.append(f"<|page-{idx}|>")
-        lines.append(f"## {p.title}")
-        lines.append(f"URL: {p.url}")
-        lines.append(f"Group: {p.group}")
-        lines.append(f"Score: {p.score}")
-        lines.append("")
-        lines.append(p.description)
-        lines.append("")
-
-    path.write_text("\n".join(lines), encoding="utf-8")
+    # 逐页流式写出（输出与逐行 "\n".join 完全一致），避免在内存中拼出整个 llms-full.txt
+    with path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+        w = f.write
+        w(f"# {config.site.base_url} llms-full.txt\n")
+        w("# Generated by llms-sitemap-generator\n")
+        w(f"# Default language: {config.site.default_language}\n")
+
+        for idx, p in enumerate(pages, start=1):
+            w(
+                f"\n<|page-{idx}|>\n## {p.title}\nURL: {p.url}\nGroup: {p.group}\n"
+                f"Score: {p.score}\n\n{p.description}\n"
+            )
     logger.info(f"Wrote llms-full.txt to {path}")
 
 
@@ -481,6 +586,6 @@ def write_llms_json(config: AppConfig, pages: List[RenderedPage], path: Path) ->
             for p in pages
         ],
     }
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    path.write_bytes(_dumps_json(data))
     logger.info(f"Wrote llms.json to {path}")
 
@@ -39,4 +39,9 @@ except ImportError as e:
         raise
 
 if __name__ == "__main__":
+    # filter_and_group_urls may start a process pool for large sitemaps; frozen
+    # Windows builds need this so child processes don't re-launch the GUI
+    import multiprocessing
+
+    multiprocessing.freeze_support()
     sys.exit(main())
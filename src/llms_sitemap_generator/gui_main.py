@@ -5,9 +5,17 @@ LLMS Sitemap Generator - GUI Tool
 
 from __future__ import annotations
 
+import csv
+import heapq
+import importlib.util
+import re
 import sys
+import threading
+import time
+from collections import defaultdict
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 try:
     from PyQt5.QtWidgets import (
@@ -19,6 +27,8 @@ try:
         QPushButton,
         QLabel,
         QTextEdit,
+        QListView,
+        QAbstractItemView,
         QTreeWidget,
         QTreeWidgetItem,
         QSplitter,
@@ -34,7 +44,7 @@ try:
         QScrollArea,
         QSizePolicy,
     )
-    from PyQt5.QtCore import Qt, QThread, pyqtSignal
+    from PyQt5.QtCore import Qt, QThread, QTimer, QStringListModel, pyqtSignal
     from PyQt5.QtGui import QFont
 except ImportError:
     print("PyQt5 is not installed. Please install it with: pip install PyQt5")
@@ -49,11 +59,14 @@ from .config import (
     SourceConfig,
     FilterRule,
 )
-from .sitemap import collect_urls_from_sources
-from .filters import filter_and_group_urls, PageEntry
-from .generator import generate_llms_txt, generate_llms_from_urls
 from .logger import get_logger
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlsplit
+
+# requests / sitemap / filters / generator 只在收集、过滤、生成时才用到，推迟导入以加快窗口启动
+if TYPE_CHECKING:
+    import requests
+
+    from .filters import PageEntry
 
 logger = get_logger(__name__)
 
@@ -62,6 +75,96 @@ try:
 except ImportError:
     yaml = None  # 如果 yaml 未安装，会在保存配置时提示
 
+# 可选依赖：pip install llms-sitemap-generator[cache]；只探测是否安装，用到时再导入
+_HAS_REQUESTS_CACHE = importlib.util.find_spec("requests_cache") is not None
+
+# 同一主机的子域名发现结果缓存 10 分钟；按住 Shift 点击按钮可跳过缓存重新发现
+_SUBDOMAIN_CACHE_TTL_S = 600
+
+# 安装了 requests-cache 时，只把 sitemap 和 robots.txt 响应缓存到磁盘（遵循 Cache-Control、ETag）；
+# 页面等其它响应不写入缓存文件，避免它随抓取量无限增长
+_HTTP_CACHE_FILE = Path.home() / ".cache" / "llms-sitemap-generator" / "http_cache.sqlite"
+_HTTP_CACHE_EXPIRE_S = 3600
+_HTTP_CACHE_SUFFIXES = ("/robots.txt", ".xml", ".xml.gz")
+
+
+def _is_cacheable_response(response: requests.Response) -> bool:
+    return urlparse(response.url).path.lower().endswith(_HTTP_CACHE_SUFFIXES)
+
+
+# 由 GUI 勾选项控制的排除规则：配置文件中含这些片段的规则在构建配置时丢弃（按字面子串匹配）
+_GUI_CONTROLLED_EXCLUDES = re.compile(
+    "|".join(
+        re.escape(fragment)
+        for fragment in ("^/blog", "^/careers", "newsroom", "/news", "^/admin", "/login")
+    )
+)
+
+
+def _preset_rules(*patterns: str) -> Tuple[FilterRule, ...]:
+    return tuple(FilterRule(pattern=p, compiled=re.compile(p)) for p in patterns)
+
+
+# 勾选项对应的排除规则在导入时构建并预编译一次，每次点击 Collect 直接复用
+_BLOG_EXCLUDES = _preset_rules("^/blog/")
+_CAREERS_EXCLUDES = _preset_rules("^/careers")
+_NEWS_EXCLUDES = _preset_rules("newsroom", "/news")
+_ADMIN_EXCLUDES = _preset_rules("^/admin", "/login")
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _cached_session() -> Optional[requests.Session]:
+    if not _HAS_REQUESTS_CACHE:
+        return None
+    from .http_session import DEFAULT_ACCEPT, DEFAULT_USER_AGENT
+
+    try:
+        import requests_cache
+
+        _HTTP_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        session = requests_cache.CachedSession(
+            str(_HTTP_CACHE_FILE),
+            backend="sqlite",
+            expire_after=_HTTP_CACHE_EXPIRE_S,
+            cache_control=True,
+            filter_fn=_is_cacheable_response,
+            # 站点暂时不可用时退回到已过期的缓存副本
+            stale_if_error=True,
+        )
+    except Exception as e:  # noqa: BLE001 - fall back to an uncached session
+        logger.warning(f"HTTP cache disabled, cannot open {_HTTP_CACHE_FILE}: {e}")
+        return None
+    try:
+        # 每个 GUI 进程启动时清理一次过期条目
+        session.cache.delete(expired=True)
+    except Exception as e:  # noqa: BLE001 - cleanup is best-effort
+        logger.warning(f"Failed to clean up HTTP cache {_HTTP_CACHE_FILE}: {e}")
+    session.headers.setdefault("User-Agent", DEFAULT_USER_AGENT)
+    session.headers.setdefault("Accept", DEFAULT_ACCEPT)
+    return session
+
+
+def _shared_session() -> requests.Session:
+    """
+    One pooled session for the whole GUI process.
+    重复点击 Collect / Discover 时复用已建立的 keep-alive 连接，不再每次重新握手；
+    安装了 requests-cache 时，未过期的 sitemap / robots.txt 响应直接从磁盘缓存返回
+    """
+    from .http_session import create_session, mount_pooled_adapter
+
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            adapter_kwargs = dict(pool_connections=32, pool_maxsize=64)
+            cached = _cached_session()
+            if cached is not None:
+                _SESSION = mount_pooled_adapter(cached, **adapter_kwargs)
+            else:
+                _SESSION = create_session(**adapter_kwargs)
+        return _SESSION
+
 
 class URLCollectionThread(QThread):
     """后台线程：收集 URL"""
@@ -76,15 +179,18 @@ class URLCollectionThread(QThread):
 
     def run(self):
         try:
-            import requests
+            from .sitemap import collect_urls_from_sources
 
-            session = requests.Session()
+            session = _shared_session()
             self.progress.emit("正在收集 URL...")
 
             # 收集失败的URL列表
             failed_urls = []
             urls = collect_urls_from_sources(
-                self.config, session, failed_urls=failed_urls
+                self.config,
+                session,
+                progress_callback=lambda message, _count: self.progress.emit(message),
+                failed_urls=failed_urls,
             )
             self.finished.emit(urls, failed_urls)
         except Exception as e:
@@ -99,8 +205,24 @@ class MainWindow(QMainWindow):
         self.filtered_pages: List[PageEntry] = []
         self.failed_urls: List[dict] = []  # 存储失败的URL
         self.discovered_subdomains: set = set()  # 存储发现的子域名
+        self._subdomain_cache: Dict[str, Tuple[float, frozenset]] = {}  # host -> (时间, 子域名)
         self.group_items: dict = {}  # 存储分组项
+        # 勾选状态和每组页面数的 Python 侧镜像，刷新列表/统计时不必逐项查询 Qt 或遍历全部页面
+        self._checked_groups: set = set()
+        self._group_counts: Dict[str, int] = {}
+        self._group_positions: Dict[str, List[int]] = {}  # 分组 -> 在 filtered_pages 中的下标（升序）
         self.collection_thread: Optional[URLCollectionThread] = None
+        # 连续勾选多个分组时合并为一次刷新（URL 列表和统计都要遍历全部页面）
+        self._selection_refresh_timer = QTimer(self)
+        self._selection_refresh_timer.setSingleShot(True)
+        self._selection_refresh_timer.setInterval(50)
+        self._selection_refresh_timer.timeout.connect(self._refresh_selection_views)
+        # 收集进度消息最多每 200ms 重绘一次，期间到达的消息只保留最新一条
+        self._pending_progress: Optional[str] = None
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.setInterval(200)
+        self._progress_timer.timeout.connect(self._flush_progress)
         self.init_ui()
 
     def init_ui(self):
@@ -194,7 +316,8 @@ class MainWindow(QMainWindow):
         )
         self.discover_subdomains_btn.setToolTip(
             "Click to discover all subdomains from sitemap and homepage. "
-            "After discovery, you can select which subdomains to include."
+            "After discovery, you can select which subdomains to include. "
+            "Results are cached for 10 minutes; Shift-click to refresh."
         )
         self.discover_subdomains_btn.clicked.connect(self.on_discover_subdomains)
         discover_btn_layout.addWidget(self.discover_subdomains_btn)
@@ -460,6 +583,15 @@ class MainWindow(QMainWindow):
         )
         action_row.addWidget(self.export_dead_links_btn)
 
+        self.clear_cache_btn = QPushButton("🧹 Clear Cache / 清除缓存")
+        self.clear_cache_btn.clicked.connect(self.clear_http_cache)
+        self.clear_cache_btn.setEnabled(_HAS_REQUESTS_CACHE)
+        self.clear_cache_btn.setToolTip(
+            "Clear cached HTTP responses and subdomain discovery results.\n"
+            "清除缓存的 HTTP 响应和子域名发现结果（HTTP 缓存需要安装 requests-cache）。"
+        )
+        action_row.addWidget(self.clear_cache_btn)
+
         action_layout.addLayout(action_row)
 
         # 进度条放在固定区底部，避免滚动时看不到
@@ -517,8 +649,12 @@ class MainWindow(QMainWindow):
         url_label = QLabel("URL List / URL 列表:")
         url_panel_layout.addWidget(url_label)
 
-        self.url_list = QTextEdit()
-        self.url_list.setReadOnly(True)
+        # 列表视图按行虚拟化渲染，不像 QTextEdit 那样为整段文本做文档排版
+        self._url_model = QStringListModel(self)
+        self.url_list = QListView()
+        self.url_list.setModel(self._url_model)
+        self.url_list.setUniformItemSizes(True)
+        self.url_list.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.url_list.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         url_panel_layout.addWidget(self.url_list)
 
@@ -541,21 +677,25 @@ class MainWindow(QMainWindow):
             )
             return
 
-        import requests
         from .subdomain_discovery import discover_subdomains_comprehensive
 
         try:
             self.discover_subdomains_btn.setEnabled(False)
             self.discover_subdomains_btn.setText("🔍 Discovering... / 发现中...")
 
-            session = requests.Session()
-            session.headers.setdefault(
-                "User-Agent",
-                "llms-sitemap-generator/0.1.0 (+https://github.com/thordata/llms-sitemap-generator)",
+            # 发现子域名（命中缓存时不再访问网络）
+            host = urlparse(base_url).netloc.lower()
+            cached = self._subdomain_cache.get(host)
+            refresh = bool(QApplication.keyboardModifiers() & Qt.ShiftModifier)
+            from_cache = bool(
+                cached and not refresh and time.time() - cached[0] < _SUBDOMAIN_CACHE_TTL_S
             )
-
-            # 发现子域名
-            discovered = discover_subdomains_comprehensive(base_url, session)
+            if from_cache:
+                discovered = set(cached[1])
+            else:
+                discovered = discover_subdomains_comprehensive(base_url, _shared_session())
+                if discovered:
+                    self._subdomain_cache[host] = (time.time(), frozenset(discovered))
             self.discovered_subdomains = discovered
 
             # 清空列表并添加发现的子域名
@@ -573,8 +713,12 @@ class MainWindow(QMainWindow):
             parsed = urlparse(base_url)
             main_domain = parsed.netloc.lower()
 
-            for domain in sorted(discovered):
-                item = QTreeWidgetItem(self.subdomain_list)
+            # 先建好无父节点的条目再一次性插入，避免每插入一项都触发重新布局
+            sorted_domains = sorted(discovered)
+            items = []
+            for domain in sorted_domains:
+                item = QTreeWidgetItem()
+                items.append(item)
                 item.setText(0, domain)
                 item.setCheckState(0, Qt.Checked)
 
@@ -586,16 +730,24 @@ class MainWindow(QMainWindow):
                     item.setText(1, "Subdomain / 子域名")
                     item.setText(2, "Discovered")
 
+            self.subdomain_list.setUpdatesEnabled(False)
+            try:
+                self.subdomain_list.addTopLevelItems(items)
+            finally:
+                self.subdomain_list.setUpdatesEnabled(True)
+
             # 启用选择按钮
             self.select_all_subdomains_btn.setEnabled(True)
             self.deselect_all_subdomains_btn.setEnabled(True)
 
             QMessageBox.information(
                 self,
-                "Discovery Complete / 发现完成",
+                "Discovery Complete / 发现完成"
+                + (" (cached / 缓存)" if from_cache else ""),
                 f"Discovered {len(discovered)} subdomain(s):\n"
                 f"发现 {len(discovered)} 个子域名：\n\n"
-                + "\n".join(sorted(discovered)),
+                + "\n".join(sorted_domains[:50])
+                + ("\n..." if len(sorted_domains) > 50 else ""),
             )
 
         except Exception as e:
@@ -640,14 +792,14 @@ class MainWindow(QMainWindow):
             raise ValueError("Base URL 不能为空")
 
         default_language = self.default_lang_input.text().strip() or "en"
-        parsed = urlparse(base_url)
-        main_domain = parsed.netloc.lower()
+        main_domain = urlsplit(base_url).netloc.lower()
+        base_root = base_url.rstrip("/")
 
         # 如果之前加载过配置，但现在用户输入的 base_url 已经切换到完全不同的站点，
         # 则视为“新站点配置”，避免继续沿用旧站点（如 thordata.com）的 allowed_domains 和 sources，
         # 以免出现“明明输入了新站点，但还是在爬旧站点”的困惑。
         if base_config is not None:
-            old_host = urlparse(base_config.site.base_url).netloc.lower()
+            old_host = urlsplit(base_config.site.base_url).netloc.lower()
 
             def _root_domain(host: str) -> str:
                 parts = host.split(".")
@@ -657,22 +809,22 @@ class MainWindow(QMainWindow):
                 # 不同根域名：重置为全新配置，仅保留过滤与输出策略
                 base_config = None
 
-        allowed_domains = [main_domain]
+        # 用 dict 做保序去重
+        allowed: Dict[str, None] = {main_domain: None}
 
         # 如果 base_config 中已经有 allowed_domains，则合并（避免丢失手写的其他子域）
         if base_config is not None and base_config.site.allowed_domains:
-            for d in base_config.site.allowed_domains:
-                d = d.lower()
-                if d and d not in allowed_domains:
-                    allowed_domains.append(d)
+            allowed.update(
+                dict.fromkeys(d.lower() for d in base_config.site.allowed_domains if d)
+            )
 
         # 如果 sitemap URL 包含不同域名，也添加
         sitemap_url = self.sitemap_url_input.text().strip()
         if sitemap_url:
-            parsed_sitemap = urlparse(sitemap_url)
-            sitemap_domain = parsed_sitemap.netloc.lower()
-            if sitemap_domain and sitemap_domain not in allowed_domains:
-                allowed_domains.append(sitemap_domain)
+            sitemap_domain = urlsplit(sitemap_url).netloc.lower()
+            if sitemap_domain:
+                allowed.setdefault(sitemap_domain)
+        allowed_domains = list(allowed)
 
         # 站点描述：优先使用 UI 中输入，其次沿用已有配置
         site_description = self.site_desc_edit.toPlainText().strip()
@@ -681,7 +833,7 @@ class MainWindow(QMainWindow):
 
         # 构建站点配置
         site = SiteConfig(
-            base_url=base_url.rstrip("/"),
+            base_url=base_root,
             default_language=default_language,
             allowed_domains=allowed_domains,
             description=site_description or None,
@@ -737,33 +889,30 @@ class MainWindow(QMainWindow):
         # 关键修复：总是添加一个从 base_url 开始的 crawl 源，作为 sitemap 的补充
         # 这样可以确保发现 sitemap 中没有覆盖到的深层页面
         # 检查是否已经有从 base_url 开始的 crawl 源
-        has_base_crawl = any(
-            s.type == "crawl" and s.url.rstrip("/") == base_url.rstrip("/")
-            for s in sources
-        )
+        # 已有 crawl 源的 URL 集合（去掉末尾斜杠），下面新增 crawl 源时同步加入
+        crawl_urls = {s.url.rstrip("/") for s in sources if s.type == "crawl"}
 
-        if not has_base_crawl:
+        if base_root not in crawl_urls:
             logger.info(
                 f"Adding base crawl source from {base_url} to supplement sitemap"
             )
             sources.append(
                 SourceConfig(
                     type="crawl",
-                    url=base_url.rstrip("/"),
+                    url=base_root,
                     max_depth=int(self.crawl_depth_spin.value()),
                     max_urls=int(self.crawl_max_urls_spin.value()),
                 )
             )
+            crawl_urls.add(base_root)
 
         # Optional: Auto-add common content sections if not excluded
         # This is a convenience feature that can be disabled if not needed
         # Users can manually add crawl sources for specific sections if needed
         common_sections = ["/blog", "/docs", "/documentation"]
         for section in common_sections:
-            section_url = f"{base_url.rstrip('/')}{section}"
-            has_section_crawl = any(
-                s.type == "crawl" and s.url.rstrip("/") == section_url for s in sources
-            )
+            section_url = f"{base_root}{section}"
+            has_section_crawl = section_url in crawl_urls
             # Only auto-add if:
             # 1. Not already in sources
             # 2. Not explicitly excluded (for blog, check exclude_blog_check)
@@ -785,17 +934,18 @@ class MainWindow(QMainWindow):
                         max_urls=int(self.crawl_max_urls_spin.value()),
                     )
                 )
+                crawl_urls.add(section_url)
 
         # 如果 sources 列表仍然为空（理论上不会，但做安全兜底）
         if not sources:
             # 优先尝试 sitemap
-            default_sitemap_url = f"{base_url.rstrip('/')}/sitemap.xml"
+            default_sitemap_url = f"{base_root}/sitemap.xml"
             sources.append(SourceConfig(type="sitemap", url=default_sitemap_url))
             # 同时添加一个从 base_url 开始的 crawl 源
             sources.append(
                 SourceConfig(
                     type="crawl",
-                    url=base_url.rstrip("/"),
+                    url=base_root,
                     max_depth=int(self.crawl_depth_spin.value()),
                     max_urls=int(self.crawl_max_urls_spin.value()),
                 )
@@ -817,38 +967,23 @@ class MainWindow(QMainWindow):
             base_default_group_limit = None
 
         # 从 base_excludes 中移除由 GUI 控制的几类规则（避免重复 / 与勾选状态冲突）
-        controlled_prefixes = [
-            "^/blog",
-            "^/careers",
-            "newsroom",
-            "/news",
-            "^/admin",
-            "/login",
+        exclude_rules: List[FilterRule] = [
+            r for r in base_excludes if not _GUI_CONTROLLED_EXCLUDES.search(r.pattern)
         ]
-        exclude_rules: List[FilterRule] = []
-        for r in base_excludes:
-            if any(
-                r.pattern.startswith(pfx) or pfx in r.pattern
-                for pfx in controlled_prefixes
-            ):
-                continue
-            exclude_rules.append(r)
 
         # 只有当用户明确勾选"排除Blog"时才排除/blog/路径（不排除 blog 子域）
         if self.exclude_blog_check.isChecked():
-            exclude_rules.append(FilterRule(pattern="^/blog/"))
+            exclude_rules.extend(_BLOG_EXCLUDES)
 
         # 其他常见路径的排除项
         if self.exclude_careers_check.isChecked():
-            exclude_rules.append(FilterRule(pattern="^/careers"))
+            exclude_rules.extend(_CAREERS_EXCLUDES)
 
         if self.exclude_news_check.isChecked():
-            exclude_rules.append(FilterRule(pattern="newsroom"))
-            exclude_rules.append(FilterRule(pattern="/news"))
+            exclude_rules.extend(_NEWS_EXCLUDES)
 
         if self.exclude_admin_check.isChecked():
-            exclude_rules.append(FilterRule(pattern="^/admin"))
-            exclude_rules.append(FilterRule(pattern="/login"))
+            exclude_rules.extend(_ADMIN_EXCLUDES)
 
         # max_urls：如果已有配置中有更大的值，优先保留更大者
         existing_max = base_config.filters.max_urls if base_config else 0
@@ -900,22 +1035,14 @@ class MainWindow(QMainWindow):
             site=site, sources=sources, filters=filters, output=output
         )
 
-        # 在 AppConfig 上挂一个 GUI 专用的动态属性，用于控制是否自动根据 sitemap 发现子域
-        # 这样不会破坏现有的配置文件结构，但爬虫层可以检测到这个开关。
-        setattr(
-            app_config,
-            "enable_auto_subdomains",
-            bool(self.auto_subdomains_check.isChecked()),
-        )
+        # GUI 专用的运行期选项：是否自动根据 sitemap 发现子域
+        # 不属于配置文件结构，但爬虫层会读取这个开关。
+        app_config.enable_auto_subdomains = bool(self.auto_subdomains_check.isChecked())
 
         # 添加用户选择的子域名（如果有）
         selected_subdomains = self.get_selected_subdomains()
         if selected_subdomains:
-            setattr(
-                app_config,
-                "selected_subdomains",
-                selected_subdomains,
-            )
+            app_config.selected_subdomains = selected_subdomains
 
         return app_config
 
@@ -962,9 +1089,25 @@ class MainWindow(QMainWindow):
         self.collection_thread.start()
 
     def on_progress(self, message: str):
+        if self._progress_timer.isActive():
+            self._pending_progress = message
+            return
         self.stats_label.setText(message)
+        self._progress_timer.start()
+
+    def _flush_progress(self):
+        if self._pending_progress is not None:
+            self.stats_label.setText(self._pending_progress)
+            self._pending_progress = None
+            self._progress_timer.start()
+
+    def _stop_progress(self):
+        # 收集结束后丢弃未显示的进度，避免覆盖随后写入的统计信息
+        self._progress_timer.stop()
+        self._pending_progress = None
 
     def on_urls_collected(self, urls: List[str], failed_urls: List[dict]):
+        self._stop_progress()
         self.all_urls = urls
         self.failed_urls = failed_urls  # Store failed URLs for export
         self.collect_btn.setEnabled(True)
@@ -1013,6 +1156,7 @@ class MainWindow(QMainWindow):
         self.apply_filters()
 
     def on_error(self, error_msg: str):
+        self._stop_progress()
         self.collect_btn.setEnabled(True)
         self.progress_bar.setVisible(False)
 
@@ -1051,6 +1195,8 @@ class MainWindow(QMainWindow):
         if not self.config:
             return
 
+        from .filters import filter_and_group_urls
+
         try:
             self.filtered_pages = filter_and_group_urls(self.config, self.all_urls)
         except Exception as e:
@@ -1074,48 +1220,47 @@ class MainWindow(QMainWindow):
 
     def update_group_tree(self):
         """更新分组树形视图"""
-        self.group_tree.clear()
-        self.group_tree.itemChanged.disconnect()  # 临时断开信号，避免触发过滤
-
-        from collections import defaultdict
-
-        groups = defaultdict(list)
-        for page in self.filtered_pages:
-            groups[page.group].append(page)
+        group_positions: Dict[str, List[int]] = defaultdict(list)
+        for i, page in enumerate(self.filtered_pages):
+            group_positions[page.group].append(i)
+        self._group_positions = dict(group_positions)
+        self._group_counts = {group: len(pos) for group, pos in group_positions.items()}
+        self._checked_groups = set(self._group_counts)
 
         self.group_items = {}  # 存储分组项，用于快速查找
-        for group_name, pages in sorted(groups.items()):
-            item = QTreeWidgetItem(self.group_tree)
-            item.setText(0, group_name)
-            item.setText(1, str(len(pages)))
+        for group_name, count in sorted(self._group_counts.items()):
+            item = QTreeWidgetItem([group_name, str(count)])
             item.setCheckState(0, Qt.Checked)
             item.setData(0, Qt.UserRole, group_name)
             self.group_items[group_name] = item
 
-        self.group_tree.itemChanged.connect(self.on_group_item_changed)  # 重新连接信号
+        # 清空和插入都在暂停重绘、屏蔽 itemChanged（避免触发过滤）期间完成，只触发一次布局和重绘
+        self.group_tree.setUpdatesEnabled(False)
+        self.group_tree.blockSignals(True)
+        try:
+            self.group_tree.clear()
+            self.group_tree.addTopLevelItems(list(self.group_items.values()))
+        finally:
+            self.group_tree.blockSignals(False)
+            self.group_tree.setUpdatesEnabled(True)
 
     def update_url_list(self):
         """更新 URL 列表（只显示已勾选的分组）"""
         if not self.filtered_pages or not hasattr(self, "group_items"):
-            self.url_list.clear()
+            self._url_model.setStringList([])
             return
 
-        # 获取已勾选的分组
-        checked_groups = set()
-        for group_name, item in self.group_items.items():
-            if item.checkState(0) == Qt.Checked:
-                checked_groups.add(group_name)
-
-        # 过滤出已勾选分组的 URL
-        filtered_urls = [
-            page.url for page in self.filtered_pages if page.group in checked_groups
-        ]
-
-        # 只显示前 100 个
-        display_urls = filtered_urls[:100]
-        self.url_list.setPlainText("\n".join(display_urls))
-        if len(filtered_urls) > 100:
-            self.url_list.append(f"\n... 还有 {len(filtered_urls) - 100} 个 URL")
+        # 只显示已勾选分组的前 100 个 URL：归并各分组的下标列表，取够即停止，不必扫描全部页面
+        checked_groups = self._checked_groups
+        pages = self.filtered_pages
+        positions = heapq.merge(
+            *(self._group_positions[g] for g in checked_groups if g in self._group_positions)
+        )
+        display_urls = [pages[i].url for i in islice(positions, 100)]
+        checked_count = sum(self._group_counts.get(g, 0) for g in checked_groups)
+        if checked_count > 100:
+            display_urls.append(f"... 还有 {checked_count - 100} 个 URL")
+        self._url_model.setStringList(display_urls)
 
     def on_group_item_changed(self, item: QTreeWidgetItem, column: int):
         """分组项状态改变"""
@@ -1123,12 +1268,16 @@ class MainWindow(QMainWindow):
             return
 
         group_name = item.data(0, Qt.UserRole)
-        is_checked = item.checkState(0) == Qt.Checked
+        if item.checkState(0) == Qt.Checked:
+            self._checked_groups.add(group_name)
+        else:
+            self._checked_groups.discard(group_name)
 
-        # 更新 URL 列表显示（只显示已勾选的分组）
-        self.update_url_list()
+        # 更新 URL 列表显示和统计信息（防抖，50ms 内的多次勾选只刷新一次）
+        self._selection_refresh_timer.start()
 
-        # 更新统计信息
+    def _refresh_selection_views(self):
+        self.update_url_list()
         self.update_stats()
 
     def update_stats(self):
@@ -1136,16 +1285,8 @@ class MainWindow(QMainWindow):
         if not hasattr(self, "group_items"):
             return
 
-        checked_groups = set()
-        for group_name, item in self.group_items.items():
-            if item.checkState(0) == Qt.Checked:
-                checked_groups.add(group_name)
-
         # 统计已勾选分组的 URL 数量
-        checked_count = sum(
-            len([p for p in self.filtered_pages if p.group == g])
-            for g in checked_groups
-        )
+        checked_count = sum(self._group_counts.get(g, 0) for g in self._checked_groups)
 
         total = len(self.all_urls)
         filtered = len(self.filtered_pages)
@@ -1167,11 +1308,12 @@ class MainWindow(QMainWindow):
         state = Qt.Checked if checked else Qt.Unchecked
         for item in self.group_items.values():
             item.setCheckState(0, state)
+        self._checked_groups = set(self.group_items) if checked else set()
 
-        # 重新连接信号并刷新统计/UI
+        # 重新连接信号并刷新统计/UI（取消尚未执行的防抖刷新）
         self.group_tree.itemChanged.connect(self.on_group_item_changed)
-        self.update_url_list()
-        self.update_stats()
+        self._selection_refresh_timer.stop()
+        self._refresh_selection_views()
 
     def select_all_groups(self):
         """一键全选所有分组"""
@@ -1181,6 +1323,28 @@ class MainWindow(QMainWindow):
         """一键取消选择所有分组"""
         self._set_all_groups_checked(False)
 
+    def clear_http_cache(self):
+        """清除磁盘 HTTP 缓存和子域名发现缓存"""
+        self._subdomain_cache.clear()
+        session = _shared_session()
+        cache = getattr(session, "cache", None)
+        try:
+            if cache is not None:
+                cache.clear()
+        except Exception as e:  # noqa: BLE001
+            QMessageBox.warning(
+                self,
+                "Clear Cache Failed / 清除缓存失败",
+                f"Failed to clear HTTP cache:\n{e}\n\n清除 HTTP 缓存失败：\n{e}",
+            )
+            return
+        QMessageBox.information(
+            self,
+            "Cache Cleared / 已清除缓存",
+            "Cached HTTP responses and subdomain results were cleared.\n"
+            "已清除缓存的 HTTP 响应和子域名发现结果。",
+        )
+
     def export_dead_links(self):
         """导出死链（404等失败的URL）"""
         if not hasattr(self, "failed_urls") or not self.failed_urls:
@@ -1205,40 +1369,46 @@ class MainWindow(QMainWindow):
             # 根据文件扩展名决定格式
             is_csv = file_path.lower().endswith(".csv")
 
-            with open(file_path, "w", encoding="utf-8") as f:
+            # 失败 URL 可能有数万条：大缓冲区 + 每组一次 writelines，避免大量零碎的 write 调用
+            with open(file_path, "w", encoding="utf-8", buffering=1 << 20) as f:
                 if is_csv:
-                    f.write("URL,Status Code,Error Message\n")
-                    for item in self.failed_urls:
-                        url = item.get("url", "")
-                        status = item.get("status_code", "N/A")
-                        error = item.get("error", "").replace(",", ";")
-                        f.write(f"{url},{status},{error}\n")
+                    # csv 模块负责引号转义，URL / 错误信息中的逗号不会错列
+                    writer = csv.writer(f, lineterminator="\n")
+                    writer.writerow(["URL", "Status Code", "Error Message"])
+                    writer.writerows(
+                        (
+                            item.get("url", ""),
+                            # 网络错误 / 超时的条目有 status_code 键但值为 None
+                            item.get("status_code") or "N/A",
+                            item.get("error", ""),
+                        )
+                        for item in self.failed_urls
+                    )
                 else:
-                    f.write("# Dead Links / 死链列表\n")
-                    f.write(f"# Generated by LLMS Sitemap Generator\n")
-                    f.write(f"# Total: {len(self.failed_urls)} failed URLs\n\n")
+                    f.write(
+                        "# Dead Links / 死链列表\n"
+                        "# Generated by LLMS Sitemap Generator\n"
+                        f"# Total: {len(self.failed_urls)} failed URLs\n\n"
+                    )
 
                     # 按状态码分组
-                    by_status = {}
+                    by_status: Dict[Optional[int], List[dict]] = defaultdict(list)
                     for item in self.failed_urls:
-                        status = item.get("status_code", "Unknown")
-                        if status not in by_status:
-                            by_status[status] = []
-                        by_status[status].append(item)
+                        by_status[item.get("status_code")].append(item)
 
                     for status in sorted(
                         by_status.keys(), key=lambda x: (x is None, x)
                     ):
                         items = by_status[status]
-                        f.write(
+                        lines = [
                             f"\n## Status {status if status else 'Unknown'} ({len(items)} URLs)\n\n"
-                        )
+                        ]
                         for item in items:
-                            url = item.get("url", "")
+                            lines.append(f"{item.get('url', '')}\n")
                             error = item.get("error", "")
-                            f.write(f"{url}\n")
                             if error:
-                                f.write(f"  Error: {error}\n")
+                                lines.append(f"  Error: {error}\n")
+                        f.writelines(lines)
 
             QMessageBox.information(
                 self,
@@ -1269,8 +1439,8 @@ class MainWindow(QMainWindow):
         if hasattr(self, "group_items"):
             checked_groups = [
                 group_name
-                for group_name, item in self.group_items.items()
-                if item.checkState(0) == Qt.Checked
+                for group_name in self.group_items
+                if group_name in self._checked_groups
             ]
             if not checked_groups:
                 QMessageBox.warning(self, "未选择分组", "请至少选择一个分组")
@@ -1307,6 +1477,8 @@ class MainWindow(QMainWindow):
                 if val > 0:
                     max_pages = val
 
+            from .generator import generate_llms_from_urls
+
             generate_llms_from_urls(
                 self.config,
                 self.all_urls,
@@ -1423,28 +1595,27 @@ class MainWindow(QMainWindow):
                 config.filters.use_default_excludes
             )
 
-            # 检查是否有 blog / careers / news / admin 等排除规则
-            has_blog_exclude = any(
-                "blog" in r.pattern.lower() and r.pattern.startswith("^/blog")
-                for r in config.filters.exclude
-            )
+            # 检查是否有 blog / careers / news / admin 等排除规则（一次遍历，全部找到即停止）
+            has_blog_exclude = has_careers_exclude = False
+            has_news_exclude = has_admin_exclude = False
+            for r in config.filters.exclude:
+                p = r.pattern
+                has_blog_exclude = has_blog_exclude or p.startswith("^/blog")
+                has_careers_exclude = has_careers_exclude or p.startswith("^/careers")
+                has_news_exclude = has_news_exclude or "newsroom" in p or "/news" in p
+                has_admin_exclude = (
+                    has_admin_exclude or p.startswith("^/admin") or "/login" in p
+                )
+                if (
+                    has_blog_exclude
+                    and has_careers_exclude
+                    and has_news_exclude
+                    and has_admin_exclude
+                ):
+                    break
             self.exclude_blog_check.setChecked(has_blog_exclude)
-
-            has_careers_exclude = any(
-                r.pattern.startswith("^/careers") for r in config.filters.exclude
-            )
             self.exclude_careers_check.setChecked(has_careers_exclude)
-
-            has_news_exclude = any(
-                ("newsroom" in r.pattern) or ("/news" in r.pattern)
-                for r in config.filters.exclude
-            )
             self.exclude_news_check.setChecked(has_news_exclude)
-
-            has_admin_exclude = any(
-                r.pattern.startswith("^/admin") or ("/login" in r.pattern)
-                for r in config.filters.exclude
-            )
             self.exclude_admin_check.setChecked(has_admin_exclude)
 
             # ------- Profile 下拉：根据配置中的 profiles 动态填充 -------
@@ -1580,10 +1751,13 @@ class MainWindow(QMainWindow):
 
             config_dict = remove_none(config_dict)
 
+            # 与 CLI 一致：优先使用 libyaml 的 C 实现
+            dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
             with open(file_path, "w", encoding="utf-8") as f:
                 yaml.dump(
                     config_dict,
                     f,
+                    Dumper=dumper,
                     allow_unicode=True,
                     default_flow_style=False,
                     sort_keys=False,
@@ -1,15 +1,41 @@
 from __future__ import annotations
 
+import codecs
 from html.parser import HTMLParser
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
 
 import re
 import requests
 
 from .logger import get_logger
 
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - aiohttp 是可选依赖（fetch.async_enabled）
+    aiohttp = None
+
+if TYPE_CHECKING:
+    from .summary_cache import CachedSummary, SummaryCache
+
 logger = get_logger(__name__)
 
+# 标题清理用到的正则（每个页面都会用到，模块级预编译一次）
+_TITLE_ICON_NOISE_RE = re.compile(
+    r"(chevron-|circle-|arrow-|sun-bright|desktop|moon|gitbook|xmark|barssearch)", re.I
+)
+_REPEATED_PIPES_RE = re.compile(r"[|]{2,}")
+# <meta charset="..."> 和 <meta http-equiv="Content-Type" content="text/html; charset=..."> 都能匹配
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+?charset\s*=\s*[\"']?\s*([A-Za-z0-9_.:-]+)", re.I)
+# 只在页面开头查找 charset 声明（HTML 规范要求它出现在前 1024 字节内，这里放宽一些）
+_CHARSET_SNIFF_BYTES = 4096
+
+# 同步抓取时流式读取页面：标题和描述确定后不再解析；正文超过上限时不再下载（与爬虫的 _read_capped 相同，连接直接关闭）
+_SUMMARY_CHUNK_SIZE = 16 * 1024
+_SUMMARY_MAX_BYTES = 1024 * 1024
+# 摘要确定后最多再读这么多字节：短页面读完后连接可复用，长页面则提前放弃并关闭连接
+_SUMMARY_DRAIN_BYTES = 64 * 1024
+
 
 class _MetaParser(HTMLParser):
     def __init__(self) -> None:
@@ -95,6 +121,14 @@ class _MetaParser(HTMLParser):
                         self.first_paragraph = text[:400]  # Limit length
                 self.current_paragraph = ""
 
+    def summary_settled(self) -> bool:
+        """True once the title has been closed and a description (meta or first paragraph) is known."""
+        return (
+            not self.in_title
+            and bool(self.title.strip())
+            and bool(self.description or self.first_paragraph)
+        )
+
     def handle_data(self, data):
         if self.in_script or self.in_style:
             return
@@ -109,34 +143,200 @@ class _MetaParser(HTMLParser):
             self.current_paragraph += data
 
 
-def fetch_basic_summary(url: str, session: requests.Session, site_name: Optional[str] = None) -> Tuple[str, str]:
+def fetch_basic_summary(
+    url: str,
+    session: requests.Session,
+    site_name: Optional[str] = None,
+    cache: Optional["SummaryCache"] = None,
+) -> Tuple[str, str]:
     """
     Fetch a page and extract a simple title + description from HTML.
     This is the non-LLM fallback for generating llms.txt entries.
+
+    With a cache, a fresh entry is returned without a request and a stale one is
+    revalidated with If-None-Match / If-Modified-Since (a 304 reuses the cached summary).
     """
+    cached, headers = _cache_lookup(cache, url, site_name)
+    if cached is not None and headers is None:
+        return cached.title, cached.description
     try:
-        resp = session.get(url, timeout=20)
-        resp.raise_for_status()
+        with session.get(url, timeout=20, headers=headers, stream=True) as resp:
+            if cached is not None and resp.status_code == 304:
+                _cache_write(cache.touch, url, site_name)
+                return cached.title, cached.description
+            resp.raise_for_status()
+            parser = _parse_html_chunks(
+                url,
+                resp.iter_content(chunk_size=_SUMMARY_CHUNK_SIZE),
+                resp.encoding,
+                max_bytes=_SUMMARY_MAX_BYTES,
+            )
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
     except Exception as e:  # noqa: BLE001
         logger.warning(f"Failed to fetch page {url}: {e}")
         return url, "No description available."
+    title, desc = _summary_from_parser(url, parser, site_name)
+    if cache is not None:
+        _cache_write(cache.store, url, site_name, title, desc, etag, last_modified)
+    return title, desc
 
-    # Try to pick a sensible encoding to avoid mojibake on UTF-8 pages
-    encoding = resp.encoding
-    if not encoding or encoding.lower() in {"iso-8859-1", "latin-1"}:
-        encoding = resp.apparent_encoding or "utf-8"
 
+async def afetch_basic_summary(
+    url: str,
+    session: "aiohttp.ClientSession",
+    site_name: Optional[str] = None,
+    cache: Optional["SummaryCache"] = None,
+) -> Tuple[str, str]:
+    """Same as fetch_basic_summary, over an aiohttp session (requires the optional aiohttp extra)."""
+    cached, headers = _cache_lookup(cache, url, site_name)
+    if cached is not None and headers is None:
+        return cached.title, cached.description
+    try:
+        async with session.get(url, headers=headers) as resp:
+            if cached is not None and resp.status == 304:
+                _cache_write(cache.touch, url, site_name)
+                return cached.title, cached.description
+            resp.raise_for_status()
+            content = await resp.read()
+            encoding = resp.charset
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+    except Exception as e:  # noqa: BLE001
+        logger.warning(f"Failed to fetch page {url}: {e}")
+        return url, "No description available."
+    title, desc = _summarize_html(url, content, encoding, site_name)
+    if cache is not None:
+        _cache_write(cache.store, url, site_name, title, desc, etag, last_modified)
+    return title, desc
+
+
+def _cache_lookup(
+    cache: Optional["SummaryCache"], url: str, site_name: Optional[str]
+) -> Tuple[Optional["CachedSummary"], Optional[Dict[str, str]]]:
+    """
+    Return (cached entry, conditional request headers).
+    headers is None with an entry when the entry is fresh (no request needed), and None
+    without an entry when there is nothing to revalidate.
+    """
+    if cache is None:
+        return None, None
     try:
-        text = resp.content.decode(encoding, errors="ignore")
-    except Exception:
-        text = resp.text
+        cached = cache.lookup(url, site_name)
+    except Exception as e:  # noqa: BLE001 - caching is best-effort
+        logger.warning(f"Summary cache lookup failed for {url}, fetching uncached: {e}")
+        return None, None
+    if cached is None:
+        return None, None
+    if cache.is_fresh(cached):
+        return cached, None
+    headers = cached.conditional_headers()
+    # 没有校验器的旧条目无法条件请求，按未缓存处理并重新抓取
+    return (cached, headers) if headers else (None, None)
+
+
+def _cache_write(write, url: str, *args) -> None:
+    """Run a cache store/touch; a failing cache (locked or corrupt sqlite file) only logs a warning."""
+    try:
+        write(url, *args)
+    except Exception as e:  # noqa: BLE001 - caching is best-effort
+        logger.warning(f"Summary cache write failed for {url}: {e}")
+
+
+def _summarize_html(
+    url: str, content: bytes, encoding: Optional[str], site_name: Optional[str]
+) -> Tuple[str, str]:
+    """Extract (title, description) from a fetched page body."""
+    return _summary_from_parser(url, _parse_html_chunks(url, (content,), encoding), site_name)
+
+
+def _parse_html_chunks(
+    url: str,
+    chunks: Iterable[bytes],
+    encoding: Optional[str],
+    max_bytes: Optional[int] = None,
+) -> _MetaParser:
+    """
+    Decode and parse an HTML body chunk by chunk.
+
+    Parsing stops once the title and description are settled. Up to _SUMMARY_DRAIN_BYTES of
+    the rest are still drained so a short page leaves its connection reusable; a longer tail
+    is abandoned (the caller closes the response). No more than max_bytes are read overall.
+    Errors raised while reading chunks propagate to the caller.
+    """
+    # Try to pick a sensible encoding to avoid mojibake on UTF-8 pages
+    # 未声明 charset（或为 HTTP 默认的 latin-1）时先严格按 UTF-8 解码，
+    # 不再调用 apparent_encoding（chardet 会逐字节扫描整个页面）
+    strict_utf8 = not encoding or encoding.lower() in {"iso-8859-1", "latin-1"}
+    if strict_utf8:
+        decoder = codecs.getincrementaldecoder("utf-8")()
+    else:
+        try:
+            decoder = codecs.getincrementaldecoder(encoding)(errors="ignore")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
 
     parser = _MetaParser()
+    parsing = True
+    # 严格 UTF-8 解码失败时需要按回退编码重新解析已读内容
+    seen = bytearray()
+    total = 0
+    drained = 0
+
+    def feed(data: bytes, final: bool = False) -> None:
+        nonlocal decoder, parser, strict_utf8, parsing
+        try:
+            text = decoder.decode(data, final)
+        except UnicodeDecodeError:
+            # 不是合法 UTF-8：优先用页面 <meta> 声明的编码，其次响应头的编码，最后 latin-1
+            strict_utf8 = False
+            fallback = _sniff_meta_charset(bytes(seen[:_CHARSET_SNIFF_BYTES])) or encoding or "latin-1"
+            decoder = codecs.getincrementaldecoder(fallback)(errors="ignore")
+            parser = _MetaParser()
+            text = decoder.decode(bytes(seen), final)
+        try:
+            parser.feed(text)
+        except Exception as e:  # noqa: BLE001
+            logger.warning(f"Failed to parse HTML for {url}: {e}")
+            parsing = False
+            return
+        if not final and parser.summary_settled():
+            parsing = False
+
+    for chunk in chunks:
+        total += len(chunk)
+        if parsing:
+            if strict_utf8:
+                seen += chunk
+            feed(chunk)
+        else:
+            drained += len(chunk)
+            if drained > _SUMMARY_DRAIN_BYTES:
+                break
+        if max_bytes is not None and total >= max_bytes:
+            break
+    else:
+        if parsing:
+            feed(b"", final=True)
+    return parser
+
+
+def _sniff_meta_charset(head: bytes) -> Optional[str]:
+    """Return the codec declared by a <meta> charset in the page head, ignoring UTF-8 and unknown names."""
+    match = _META_CHARSET_RE.search(head)
+    if not match:
+        return None
     try:
-        parser.feed(text)
-    except Exception as e:  # noqa: BLE001
-        logger.warning(f"Failed to parse HTML for {url}: {e}")
+        name = codecs.lookup(match.group(1).decode("ascii")).name
+    except LookupError:
+        return None
+    # 调用时 UTF-8 已经解码失败，声明为 UTF-8 也不可信
+    return None if name == "utf-8" else name
 
+
+def _summary_from_parser(
+    url: str, parser: _MetaParser, site_name: Optional[str]
+) -> Tuple[str, str]:
     # Use title, fallback to h1, fallback to h2, fallback to url
     raw_title = parser.title.strip() or parser.h1.strip() or parser.h2.strip() or url
 
@@ -156,7 +356,6 @@ def fetch_basic_summary(url: str, session: requests.Session, site_name: Optional
     # If still no description, generate a meaningful one from title/URL
     if not desc or len(desc) < 10:
         # Extract site name from URL if not provided
-        from urllib.parse import urlparse
         parsed = urlparse(url)
         domain = parsed.netloc or ""
         # Extract site name from domain (e.g., www.example.com -> example)
@@ -214,13 +413,8 @@ def fetch_basic_summary(url: str, session: requests.Session, site_name: Optional
 
     # 2）进一步去掉明显的图标/控制字符噪声
     if len(title) > 80:
-        title = re.sub(
-            r"(chevron-|circle-|arrow-|sun-bright|desktop|moon|gitbook|xmark|barssearch)",
-            "",
-            title,
-            flags=re.I,
-        )
-        title = re.sub(r"[|]{2,}", "|", title)
+        title = _TITLE_ICON_NOISE_RE.sub("", title)
+        title = _REPEATED_PIPES_RE.sub("|", title)
         title = " ".join(title.split())
 
     return title, desc
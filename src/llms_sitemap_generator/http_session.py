@@ -0,0 +1,71 @@
+"""
+Shared requests.Session helpers
+统一的 HTTP 会话构建（连接池 + 默认请求头）
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_USER_AGENT = (
+    "llms-sitemap-generator/0.1.0 (+https://github.com/thordata/llms-sitemap-generator)"
+)
+DEFAULT_ACCEPT = "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+
+
+def mount_pooled_adapter(
+    session: requests.Session,
+    *,
+    pool_connections: int = 10,
+    pool_maxsize: int = 20,
+    retries: int = 0,
+    backoff_factor: float = 1.0,
+    status_forcelist: Iterable[int] = (429, 500, 502, 503, 504),
+) -> requests.Session:
+    """
+    Mount an HTTPAdapter with a larger connection pool on both http:// and https://,
+    so repeated requests reuse keep-alive sockets.
+
+    By default the adapter only pools connections: the crawler already retries 429/5xx
+    with its own backoff, and adapter retries underneath would multiply every attempt.
+    Pass retries > 0 only for sessions whose requests have no retry loop of their own.
+    """
+    retry_strategy = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=list(status_forcelist),
+        # 重试用尽时返回最后一个 429/5xx 响应而不是抛 RetryError，调用方仍能拿到状态码
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry_strategy,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # collect_urls_from_sources 据此跳过重复挂载，保留调用方调好的连接池
+    session._adapter_configured = True
+    return session
+
+
+def response_text(resp: requests.Response) -> str:
+    """
+    Decode a response body like resp.text, but without requests' chardet fallback
+    (apparent_encoding scans every byte in Python): with no declared charset, decode as UTF-8.
+    """
+    try:
+        return resp.content.decode(resp.encoding or "utf-8", errors="replace")
+    except LookupError:
+        return resp.content.decode("utf-8", errors="replace")
+
+
+def create_session(**adapter_kwargs) -> requests.Session:
+    """Create a session with default headers and a pooled adapter mounted."""
+    session = requests.Session()
+    session.headers.setdefault("User-Agent", DEFAULT_USER_AGENT)
+    session.headers.setdefault("Accept", DEFAULT_ACCEPT)
+    return mount_pooled_adapter(session, **adapter_kwargs)
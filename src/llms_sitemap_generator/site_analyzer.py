@@ -5,15 +5,20 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Set, Optional
 from urllib.parse import urlparse, urljoin
 import requests
 
+from .http_session import mount_pooled_adapter
 from .logger import get_logger
 from .sitemap import _fetch_xml, _parse_sitemap_xml
 
 logger = get_logger(__name__)
 
+# 栏目探测的并发数：不超过 requests 默认连接池大小（10），避免多余连接被丢弃
+_SECTION_PROBE_WORKERS = 8
+
 
 class SiteAnalyzer:
     """Analyze website structure and recommend optimal configuration"""
@@ -26,6 +31,9 @@ class SiteAnalyzer:
             "User-Agent",
             "llms-sitemap-generator/0.1.0 (+https://github.com/thordata/llms-sitemap-generator)",
         )
+        # 与 collect_urls_from_sources 一致：调用方已挂载好连接池的会话保持不变
+        if not hasattr(self.session, "_adapter_configured"):
+            mount_pooled_adapter(self.session, pool_connections=32, pool_maxsize=64)
 
         # Analysis results
         self.has_sitemap = False
@@ -69,7 +77,7 @@ class SiteAnalyzer:
                 if resp.status_code == 200:
                     self.has_sitemap = True
                     self.sitemap_urls.append(url)
-                    urls = _parse_sitemap_xml(resp.text, source_url=url)
+                    urls = _parse_sitemap_xml(resp.content, source_url=url)
                     self.estimated_page_count = len(urls)
                     logger.info(f"Found sitemap at {url} with {len(urls)} URLs")
                     break
@@ -89,21 +97,31 @@ class SiteAnalyzer:
             "careers": ["/careers", "/jobs", "/hiring", "/work-with-us"],
         }
 
+        # 所有候选路径并发 HEAD 一次（/help 等重复路径只请求一次），再按原顺序为每个栏目取第一个命中
+        urls = list(
+            dict.fromkeys(
+                urljoin(self.base_url, path)
+                for paths in common_sections.values()
+                for path in paths
+            )
+        )
+        with ThreadPoolExecutor(max_workers=_SECTION_PROBE_WORKERS) as executor:
+            reachable = dict(zip(urls, executor.map(self._is_reachable, urls)))
+
         for section_name, paths in common_sections.items():
-            found_urls = []
             for path in paths:
                 url = urljoin(self.base_url, path)
-                try:
-                    resp = self.session.head(url, timeout=5, allow_redirects=True)
-                    if resp.status_code == 200:
-                        found_urls.append(url)
-                        break  # Found one for this section
-                except Exception:
-                    pass
-
-            if found_urls:
-                self.detected_sections[section_name] = found_urls
-                logger.info(f"Detected section '{section_name}' at {found_urls[0]}")
+                if reachable[url]:
+                    self.detected_sections[section_name] = [url]
+                    logger.info(f"Detected section '{section_name}' at {url}")
+                    break  # Found one for this section
+
+    def _is_reachable(self, url: str) -> bool:
+        try:
+            resp = self.session.head(url, timeout=5, allow_redirects=True)
+            return resp.status_code == 200
+        except Exception:
+            return False
 
     def _discover_subdomains(self):
         """Discover subdomains from sitemap if available"""
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
-from typing import List, Set
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 from urllib.parse import urlparse
+from xml.sax.saxutils import escape as _xml_escape
 import xml.etree.ElementTree as ET
+import zlib
 
 import requests
 
 from .config import AppConfig, SourceConfig
 from .crawler import crawl_site
 from .subdomain_discovery import enhance_sources_with_subdomains
+from .http_session import mount_pooled_adapter, response_text
 from .logger import get_logger
 from .url_utils import normalize_url, root_domain_from_host
 
@@ -30,7 +37,7 @@ def _discover_sitemaps_from_robots(
         resp = session.get(robots_url, timeout=10)
         if resp.status_code != 200:
             return []
-        text = resp.text or ""
+        text = response_text(resp)
     except Exception:  # noqa: BLE001
         return []
 
@@ -65,17 +72,126 @@ def _is_allowed_domain(config: AppConfig, url: str) -> bool:
     return host in config.site.allowed_domains
 
 
-def _fetch_xml(url: str, session: requests.Session) -> str:
+def _fetch_xml(url: str, session: requests.Session) -> bytes:
+    # 返回原始字节，由 XML 解析器按 <?xml encoding=...?> 解码，避免 resp.text 的编码探测
     resp = session.get(url, timeout=15)
     resp.raise_for_status()
-    return resp.text
+    return resp.content
 
 
-def _parse_sitemap_xml(xml_text: str, source_url: str = "") -> List[str]:
+_SITEMAP_CHUNK_SIZE = 64 * 1024
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+class _SitemapLocParser:
+    """
+    Incremental <loc> extractor for <urlset> / <sitemapindex> documents.
+
+    数据可以边下载边 feed()；每个 <url> / <sitemap> 处理完即清空，峰值内存与文件大小无关。
+    结果与 ET.fromstring 后 findall(".//{*}url/{*}loc") 相同；解析出错时返回空列表。
+    """
+
+    def __init__(self) -> None:
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._root: Optional[ET.Element] = None
+        self._entry = ""  # "url" / "sitemap"；其他根元素不提取任何 URL
+        self._depth = 0
+        self._marks: List[int] = []
+        self._local_names: Dict[str, str] = {}
+        self._head: Union[str, bytes, None] = None
+        self.locs: List[str] = []
+        self.error: Optional[Exception] = None
+
+    def feed(self, data: Union[str, bytes]) -> None:
+        if self.error is not None:
+            return
+        if self._head is None:
+            self._head = data[:500]
+        try:
+            self._parser.feed(data)
+            self._drain()
+        except Exception as e:  # noqa: BLE001 - reported by close()
+            self.error = e
+
+    def close(self, source_url: str = "") -> List[str]:
+        if self.error is None:
+            try:
+                self._parser.close()
+                self._drain()
+            except Exception as e:  # noqa: BLE001
+                self.error = e
+        if self.error is None:
+            return self.locs
+
+        source_info = f" from {source_url}" if source_url else ""
+        if isinstance(self.error, ET.ParseError):
+            logger.warning(f"Failed to parse sitemap XML{source_info}: {self.error}")
+            logger.debug(f"XML content preview (first 500 chars): {self._head}")
+        else:
+            logger.warning(f"Unexpected error parsing sitemap{source_info}: {self.error}")
+        return []
+
+    def _drain(self) -> None:
+        entry = self._entry
+        depth = self._depth
+        locs = self.locs
+        marks = self._marks
+        local_names = self._local_names
+        for event, elem in self._parser.read_events():
+            tag = elem.tag
+            name = local_names.get(tag)
+            if name is None:
+                name = local_names[tag] = tag.rpartition("}")[2]
+            if event == "start":
+                depth += 1
+                if self._root is None:
+                    self._root = elem
+                    root_tag = tag.lower()
+                    if root_tag.endswith("urlset"):
+                        entry = self._entry = "url"
+                    elif root_tag.endswith("sitemapindex"):
+                        entry = self._entry = "sitemap"
+                elif name == entry:
+                    # 记录开始位置：嵌套的条目先结束，仍需按文档先序把外层的 <loc> 排在前面
+                    marks.append(len(locs))
+                continue
+
+            depth -= 1
+            if name == entry and depth:
+                mark = marks.pop()
+                found = [
+                    child.text.strip()
+                    for child in elem
+                    if child.text and local_names.get(child.tag) == "loc"
+                ]
+                if mark == len(locs):
+                    locs += found
+                else:
+                    locs[mark:mark] = found
+                elem.clear()
+            if depth == 1:
+                # 根元素的直接子元素已处理完，从树上摘掉
+                self._root.clear()
+        self._depth = depth
+
+
+def _parse_sitemap_chunks(
+    chunks: Iterable[Union[str, bytes]], source_url: str = ""
+) -> List[str]:
+    # 下载过程中的网络异常不在这里捕获，与一次性读取 resp.content 时一样向上抛出
+    parser = _SitemapLocParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+        if parser.error is not None:
+            break
+    return parser.close(source_url)
+
+
+def _parse_sitemap_xml(xml_text: Union[str, bytes], source_url: str = "") -> List[str]:
     """Parse sitemap XML and extract URLs.
 
     Args:
-        xml_text: The XML content to parse
+        xml_text: The XML content to parse (raw bytes or already-decoded text)
         source_url: Optional source URL for error reporting
 
     Returns:
@@ -104,24 +220,152 @@ def _parse_sitemap_xml(xml_text: str, source_url: str = "") -> List[str]:
     return urls
 
 
+def _iter_sitemap_body(resp: requests.Response) -> Iterator[bytes]:
+    """Yield a streamed response body chunk by chunk, gunzipping *.xml.gz payloads on the fly."""
+    decompressor = None
+    first = True
+    for chunk in resp.iter_content(chunk_size=_SITEMAP_CHUNK_SIZE):
+        if first:
+            first = False
+            if chunk[:2] == _GZIP_MAGIC:
+                decompressor = zlib.decompressobj(wbits=31)
+        yield decompressor.decompress(chunk) if decompressor is not None else chunk
+
+
+_SITEMAP_FETCH_WORKERS = 8
+
+
+def _is_sitemap_url(url: str) -> bool:
+    """Whether a <loc> from a sitemap index points at another sitemap (plain or gzipped)."""
+    return url.endswith((".xml", ".xml.gz"))
+
+
+def _fetch_sitemap_entries(url: str, session: requests.Session) -> List[str]:
+    # 边下载边解析，不在内存中保留整个 sitemap 文件
+    with session.get(url, timeout=15, stream=True) as resp:
+        resp.raise_for_status()
+        return _parse_sitemap_chunks(_iter_sitemap_body(resp), source_url=url)
+
+
+# 下载并解析单个 sitemap 的函数；预取数据源时换成可取消、会记录结果的版本
+_SitemapFetch = Callable[[str, requests.Session], List[str]]
+
+
+class _FetchCancelled(Exception):
+    """Raised inside a background sitemap job once collection no longer needs its result."""
+
+
+def _recording_fetch(stop: threading.Event, fetched: Dict[str, List[str]]) -> _SitemapFetch:
+    def fetch(url: str, session: requests.Session) -> List[str]:
+        if stop.is_set():
+            raise _FetchCancelled(url)
+        entries = _fetch_sitemap_entries(url, session)
+        fetched[url] = entries
+        return entries
+
+    return fetch
+
+
+def _replaying_fetch(fetched: Dict[str, List[str]]) -> _SitemapFetch:
+    def fetch(url: str, session: requests.Session) -> List[str]:
+        entries = fetched.get(url)
+        return entries if entries is not None else _fetch_sitemap_entries(url, session)
+
+    return fetch
+
+
 def _expand_sitemap_index(
-    url: str, session: requests.Session, seen: Set[str]
+    url: str,
+    session: requests.Session,
+    seen: Set[str],
+    executor: Optional[ThreadPoolExecutor] = None,
+    pending: Optional[Dict[str, "Future[List[str]]"]] = None,
+    fetch: _SitemapFetch = _fetch_sitemap_entries,
 ) -> List[str]:
     if url in seen:
         return []
     seen.add(url)
 
-    xml_text = _fetch_xml(url, session)
-    candidates = _parse_sitemap_xml(xml_text, source_url=url)
+    future = pending.pop(url, None) if pending is not None else None
+    candidates = future.result() if future is not None else fetch(url, session)
+    if executor is not None and pending is not None:
+        _prefetch_child_sitemaps(candidates, session, seen, executor, pending, fetch)
     urls: List[str] = []
     for c in candidates:
-        if c.endswith(".xml"):
-            urls.extend(_expand_sitemap_index(c, session, seen))
+        if _is_sitemap_url(c):
+            urls.extend(_expand_sitemap_index(c, session, seen, executor, pending, fetch))
         else:
             urls.append(c)
     return urls
 
 
+def _prefetch_child_sitemaps(
+    candidates: List[str],
+    session: requests.Session,
+    seen: Set[str],
+    executor: ThreadPoolExecutor,
+    pending: Dict[str, "Future[List[str]]"],
+    fetch: _SitemapFetch = _fetch_sitemap_entries,
+) -> None:
+    for c in candidates:
+        if _is_sitemap_url(c) and c not in seen and c not in pending:
+            pending[c] = executor.submit(fetch, c, session)
+
+
+def _expand_sitemap_candidates(
+    candidates: List[str],
+    session: requests.Session,
+    seen: Set[str],
+    fetch: _SitemapFetch = _fetch_sitemap_entries,
+) -> List[str]:
+    """
+    Expand the child sitemaps (*.xml, *.xml.gz) listed in a sitemap index, keeping plain URLs in place.
+
+    子 sitemap 在线程池中并发下载和解析，但仍按深度优先顺序消费结果：
+    返回的 URL 顺序、seen 的去重效果和出错时抛出的异常都与逐个下载时相同。
+    """
+    executor = ThreadPoolExecutor(
+        max_workers=_SITEMAP_FETCH_WORKERS, thread_name_prefix="sitemap-fetch"
+    )
+    pending: Dict[str, "Future[List[str]]"] = {}
+    try:
+        _prefetch_child_sitemaps(candidates, session, seen, executor, pending, fetch)
+        urls: List[str] = []
+        for c in candidates:
+            if _is_sitemap_url(c):
+                urls.extend(_expand_sitemap_index(c, session, seen, executor, pending, fetch))
+            else:
+                urls.append(c)
+        return urls
+    finally:
+        # 被 seen 跳过或出错后未消费的预取：未开始的取消，已在下载的等它结束，返回后不再占用 session
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+# 合并循环之前最多预取的 sitemap 数据源个数
+_SOURCE_PREFETCH_WINDOW = 4
+
+_IsolatedResult = Tuple[List[str], Set[str], Dict[str, List[str]]]
+
+
+def _collect_sitemap_isolated(
+    src: SourceConfig, config: AppConfig, session: requests.Session, stop: threading.Event
+) -> _IsolatedResult:
+    """
+    Background job for one sitemap source: expand it with its own seen set.
+
+    Returns (urls, visited sitemaps, parsed downloads) so an overlapping source can be
+    re-expanded against the shared seen set without fetching again; once stop is set the
+    job raises _FetchCancelled at its next download.
+    """
+    seen: Set[str] = set()
+    fetched: Dict[str, List[str]] = {}
+    urls = _collect_from_sitemap_source(
+        src, config, session, seen, fetch=_recording_fetch(stop, fetched)
+    )
+    return urls, seen, fetched
+
+
 def collect_urls_from_sources(
     config: AppConfig,
     session: requests.Session,
@@ -152,33 +396,32 @@ def collect_urls_from_sources(
 
     # Configure connection pooling for better performance
     if not hasattr(session, "_adapter_configured"):
-        from requests.adapters import HTTPAdapter
-        from urllib3.util.retry import Retry
-
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(
-            pool_connections=10,
-            pool_maxsize=20,
-            max_retries=retry_strategy,
-        )
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        mount_pooled_adapter(session, pool_connections=10, pool_maxsize=20)
         session._adapter_configured = True
 
+    # 逐源合并时就丢弃完全相同的 URL（重叠的 sitemap / crawl 源可能产生大量重复），
+    # collected_count 仍按原始数量计数，全局额度和日志与保留重复时一致
     collected: List[str] = []
+    collected_seen: Set[str] = set()
+    collected_count = 0
+
+    def _add_collected(urls: List[str]) -> None:
+        nonlocal collected_count
+        collected_count += len(urls)
+        for u in urls:
+            if u not in collected_seen:
+                collected_seen.add(u)
+                collected.append(u)
+
     seen: Set[str] = set()
 
     # Optional enhancement: If auto subdomain discovery is enabled (typically by GUI),
     # automatically discover and add subdomain sources based on sitemap
-    selected_subdomains = getattr(config, "selected_subdomains", None)
-    if getattr(config, "enable_auto_subdomains", False):
+    selected_subdomains = config.selected_subdomains
+    if config.enable_auto_subdomains:
         try:
             if progress_callback:
-                progress_callback("Discovering subdomains...", len(collected))
+                progress_callback("Discovering subdomains...", collected_count)
             logger.info("Auto-discovering subdomains...")
             from .subdomain_discovery import enhance_sources_with_subdomains
 
@@ -208,85 +451,118 @@ def collect_urls_from_sources(
 
     total_sources = len(config.sources)
     global_max = config.filters.max_urls
-    for idx, src in enumerate(config.sources, 1):
-        if progress_callback:
-            progress_callback(
-                f"Processing source {idx}/{total_sources}: {src.type} from {src.url}",
-                len(collected),
-            )
 
-        # 如果已经达到全局 URL 上限，则提前停止后续数据源处理
-        if len(collected) >= global_max:
-            logger.info(
-                f"Global max_urls={global_max} reached while processing sources; "
-                "skipping remaining sources."
-            )
-            break
+    # 多个 sitemap 源在后台提前预取，最多领先合并循环 _SOURCE_PREFETCH_WINDOW 个源；
+    # 合并、全局额度和 crawl 仍按源顺序串行处理，结果与逐个处理一致
+    upcoming = iter([(i, s) for i, s in enumerate(config.sources, 1) if s.type == "sitemap"])
+    executor: Optional[ThreadPoolExecutor] = None
+    jobs: Dict[int, "Future[_IsolatedResult]"] = {}
+    stop = threading.Event()
 
-        if src.type == "sitemap":
-            urls = _collect_from_sitemap_source(src, config, session, seen)
-            if urls:
-                logger.info(f"Collected {len(urls)} URLs from sitemap: {src.url}")
-                if progress_callback:
-                    progress_callback(
-                        f"Collected {len(urls)} URLs from sitemap",
-                        len(collected) + len(urls),
-                    )
-            collected.extend(urls)
-        elif src.type == "crawl":
-            # 为 crawl 源设置「剩余额度」：即使单源 max_urls 很大，也不能超过全局剩余预算
-            per_source_max = src.max_urls or config.filters.max_urls
-            remaining_budget = max(global_max - len(collected), 0)
-            if remaining_budget <= 0:
-                logger.info(
-                    "Global crawl budget exhausted before this source; "
-                    f"skipping crawl for {src.url}"
+    def _prefetch_sources(n: int) -> None:
+        for i, s in islice(upcoming, n):
+            jobs[i] = executor.submit(_collect_sitemap_isolated, s, config, session, stop)
+
+    if sum(1 for s in config.sources if s.type == "sitemap") > 1:
+        executor = ThreadPoolExecutor(
+            max_workers=_SOURCE_PREFETCH_WINDOW, thread_name_prefix="sitemap-source"
+        )
+        _prefetch_sources(_SOURCE_PREFETCH_WINDOW)
+    try:
+        for idx, src in enumerate(config.sources, 1):
+            if progress_callback:
+                progress_callback(
+                    f"Processing source {idx}/{total_sources}: {src.type} from {src.url}",
+                    collected_count,
                 )
-                continue
-            if per_source_max > remaining_budget:
+
+            # 如果已经达到全局 URL 上限，则提前停止后续数据源处理
+            if collected_count >= global_max:
                 logger.info(
-                    f"Adjusting crawl max_urls for {src.url} from {per_source_max} "
-                    f"down to remaining budget {remaining_budget}"
+                    f"Global max_urls={global_max} reached while processing sources; "
+                    "skipping remaining sources."
                 )
-                per_source_max = remaining_budget
-            logger.info(
-                f"Crawling site from {src.url} "
-                f"(max_depth={src.max_depth}, max_urls={per_source_max})"
-            )
-            if progress_callback:
-                progress_callback(f"Crawling {src.url}...", len(collected))
-            urls = crawl_site(
-                src.url,
-                allowed_hosts=set(config.site.allowed_domains),
-                session=session,
-                max_urls=per_source_max,
-                max_depth=src.max_depth,
-                root_domain=root_domain,
-                allow_same_root_subdomains=bool(
-                    getattr(config, "enable_auto_subdomains", False)
-                ),
-                polite=bool(getattr(config, "polite_crawl", True)),
-                failed_urls=failed_urls,
-            )
-            if urls:
-                logger.info(f"Collected {len(urls)} URLs from crawling: {src.url}")
-                if progress_callback:
-                    progress_callback(
-                        f"Collected {len(urls)} URLs from crawling",
-                        len(collected) + len(urls),
+                break
+
+            if src.type == "sitemap":
+                job = jobs.pop(idx, None)
+                if job is None:
+                    urls = _collect_from_sitemap_source(src, config, session, seen)
+                else:
+                    _prefetch_sources(1)
+                    urls, visited, fetched = job.result()
+                    if visited.isdisjoint(seen):
+                        seen |= visited
+                    else:
+                        # 与前面的源共用了子 sitemap：按共享 seen 用已下载的内容重新展开，保持串行时的结果
+                        urls = _collect_from_sitemap_source(
+                            src, config, session, seen, fetch=_replaying_fetch(fetched)
+                        )
+                if urls:
+                    logger.info(f"Collected {len(urls)} URLs from sitemap: {src.url}")
+                    if progress_callback:
+                        progress_callback(
+                            f"Collected {len(urls)} URLs from sitemap",
+                            collected_count + len(urls),
+                        )
+                _add_collected(urls)
+            elif src.type == "crawl":
+                # 为 crawl 源设置「剩余额度」：即使单源 max_urls 很大，也不能超过全局剩余预算
+                per_source_max = src.max_urls or config.filters.max_urls
+                remaining_budget = max(global_max - collected_count, 0)
+                if remaining_budget <= 0:
+                    logger.info(
+                        "Global crawl budget exhausted before this source; "
+                        f"skipping crawl for {src.url}"
                     )
-            collected.extend(urls)
-        elif src.type == "static":
-            urls = src.urls
-            if not urls and src.url:
-                urls = [src.url]
-            if urls:
-                logger.info(f"Collected {len(urls)} static URLs")
-                if progress_callback:
-                    progress_callback(
-                        f"Collected {len(urls)} static URLs", len(collected) + len(urls)
+                    continue
+                if per_source_max > remaining_budget:
+                    logger.info(
+                        f"Adjusting crawl max_urls for {src.url} from {per_source_max} "
+                        f"down to remaining budget {remaining_budget}"
                     )
-            collected.extend(urls)
+                    per_source_max = remaining_budget
+                logger.info(
+                    f"Crawling site from {src.url} "
+                    f"(max_depth={src.max_depth}, max_urls={per_source_max})"
+                )
+                if progress_callback:
+                    progress_callback(f"Crawling {src.url}...", collected_count)
+                urls = crawl_site(
+                    src.url,
+                    allowed_hosts=set(config.site.allowed_domains),
+                    session=session,
+                    max_urls=per_source_max,
+                    max_depth=src.max_depth,
+                    root_domain=root_domain,
+                    allow_same_root_subdomains=config.enable_auto_subdomains,
+                    polite=config.polite_crawl,
+                    failed_urls=failed_urls,
+                )
+                if urls:
+                    logger.info(f"Collected {len(urls)} URLs from crawling: {src.url}")
+                    if progress_callback:
+                        progress_callback(
+                            f"Collected {len(urls)} URLs from crawling",
+                            collected_count + len(urls),
+                        )
+                _add_collected(urls)
+            elif src.type == "static":
+                urls = src.urls
+                if not urls and src.url:
+                    urls = [src.url]
+                if urls:
+                    logger.info(f"Collected {len(urls)} static URLs")
+                    if progress_callback:
+                        progress_callback(
+                            f"Collected {len(urls)} static URLs", collected_count + len(urls)
+                        )
+                _add_collected(urls)
+    finally:
+        if executor is not None:
+            # 提前达到全局上限或出错时：未开始的预取直接取消，正在运行的在下一次下载前退出，等它们结束后再返回
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
 
     # If sitemap sources yielded nothing, try robots.txt sitemap discovery as a fallback.
     # This helps for many frameworks (Next.js, etc.) that declare sitemaps in robots.txt.
@@ -310,7 +586,7 @@ def collect_urls_from_sources(
                 )
                 if urls:
                     logger.info(f"Collected {len(urls)} URLs from robots sitemap: {sm}")
-                collected.extend(urls)
+                _add_collected(urls)
 
     # De-duplicate and enforce same-site + global max_urls
     # Key fix: URL deduplication must handle trailing slash variations
@@ -336,33 +612,32 @@ def collect_urls_from_sources(
             logger.info(f"Reached global max_urls={global_max}, truncating URL list.")
             break
 
-    removed = len(collected) - len(unique)
+    removed = collected_count - len(unique)
     if removed > 0:
         logger.info(
-            f"URL deduplication: {len(collected)} -> {len(unique)} URLs (removed {removed} duplicates)"
+            f"URL deduplication: {collected_count} -> {len(unique)} URLs (removed {removed} duplicates)"
         )
     return unique
 
 
 def _collect_from_sitemap_source(
-    src: SourceConfig, config: AppConfig, session: requests.Session, seen: Set[str]
+    src: SourceConfig,
+    config: AppConfig,
+    session: requests.Session,
+    seen: Set[str],
+    fetch: _SitemapFetch = _fetch_sitemap_entries,
 ) -> List[str]:
     try:
-        xml_text = _fetch_xml(src.url, session)
+        urls = fetch(src.url, session)
+    except _FetchCancelled:
+        raise
     except Exception as e:  # noqa: BLE001
         logger.warning(f"Failed to fetch sitemap {src.url}: {e}")
         return []
 
-    urls = _parse_sitemap_xml(xml_text, source_url=src.url)
     # If result looks like sitemap index, expand recursively
-    if any(u.endswith(".xml") for u in urls):
-        all_urls: List[str] = []
-        for u in urls:
-            if u.endswith(".xml"):
-                all_urls.extend(_expand_sitemap_index(u, session, seen))
-            else:
-                all_urls.append(u)
-        return all_urls
+    if any(_is_sitemap_url(u) for u in urls):
+        return _expand_sitemap_candidates(urls, session, seen, fetch)
 
     return urls
 
@@ -374,21 +649,43 @@ def write_sitemap_xml(config: AppConfig, urls: List[str], path: str) -> None:
     - lastmod / changefreq / priority are not enforced for now, keeping it simple and generic.
       Will be enhanced in future versions when reliable data sources are available.
     """
-    from pathlib import Path
     path_obj = Path(path)
     # Ensure output directory exists
     path_obj.parent.mkdir(parents=True, exist_ok=True)
-    
-    urlset = ET.Element(
-        "urlset", attrib={"xmlns": "http://www.sitemaps.org/schemas/sitemap/0.9"}
-    )
-
-    for u in urls:
-        url_el = ET.SubElement(urlset, "url")
-        loc_el = ET.SubElement(url_el, "loc")
-        loc_el.text = u
 
-    tree = ET.ElementTree(urlset)
     # Use utf-8 + XML declaration for compatibility with major search engines
-    tree.write(str(path_obj), encoding="utf-8", xml_declaration=True)
+    _write_loc_xml(path_obj, "urlset", "url", urls)
     logger.info(f"Wrote sitemap.xml to {path_obj}")
+
+
+_SITEMAP_XMLNS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+def _write_loc_xml(
+    path: Path,
+    root_tag: str,
+    entry_tag: str,
+    locs: Iterable[str],
+    lastmod: Optional[str] = None,
+) -> None:
+    """
+    Stream a <urlset> / <sitemapindex> of <loc> entries straight to path.
+
+    输出与用 ElementTree 建树后 tree.write(encoding="utf-8", xml_declaration=True) 逐字节一致，
+    但不为每个 URL 创建 Element 对象，也不在内存中序列化整棵树。
+    """
+    head = f"<{entry_tag}><loc>"
+    rest = f"<lastmod>{_xml_escape(lastmod)}</lastmod></{entry_tag}>" if lastmod else f"</{entry_tag}>"
+    tail = "</loc>" + rest
+    # ElementTree 对空文本写出自闭合标签
+    empty_entry = f"<{entry_tag}><loc />" + rest
+    with path.open("w", encoding="utf-8", errors="xmlcharrefreplace", buffering=1 << 20) as f:
+        w = f.write
+        w(f"<?xml version='1.0' encoding='utf-8'?>\n<{root_tag} xmlns=\"{_SITEMAP_XMLNS}\"")
+        empty = True
+        for loc in locs:
+            if empty:
+                w(">")
+                empty = False
+            w(head + _xml_escape(loc) + tail if loc else empty_entry)
+        w(" />" if empty else f"</{root_tag}>")
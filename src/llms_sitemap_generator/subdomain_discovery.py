@@ -5,25 +5,149 @@ Automatically discover subdomains and collect URLs from all subdomains
 
 from __future__ import annotations
 
-from typing import List, Set
-from urllib.parse import urlparse
+from html.parser import HTMLParser
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from urllib.parse import urljoin, urlparse
 import requests
 
 from .config import AppConfig, SourceConfig
+from .http_session import response_text
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
 
+# 每个主机上找到的 sitemap 地址挂在 session 上（与 _adapter_configured 相同的做法），重复发现时跳过探测
+_SITEMAP_LOCATIONS_ATTR = "_sitemap_locations"
+
+
+class _HomepageLinkParser(HTMLParser):
+    """Collect <a href> targets and <link rel="sitemap"> declarations from a page."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.links: Set[str] = set()
+        self.sitemap_links: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            for k, v in attrs:
+                if k == "href" and v:
+                    self.links.add(v)
+        elif tag == "link":
+            attr = dict(attrs)
+            rel = (attr.get("rel") or "").lower().split()
+            if "sitemap" in rel and attr.get("href"):
+                self.sitemap_links.append(attr["href"])
+
+
+def _parse_homepage(base_url: str, session: requests.Session) -> Optional[_HomepageLinkParser]:
+    try:
+        resp = session.get(base_url, timeout=10)
+        if resp.status_code != 200:
+            return None
+        parser = _HomepageLinkParser()
+        parser.feed(response_text(resp))
+        return parser
+    except Exception as e:  # noqa: BLE001
+        logger.debug(f"Could not read homepage {base_url}: {e}")
+        return None
+
+
+def _root_domain(host: str) -> str:
+    parts = host.split(".")
+    return ".".join(parts[-2:]) if len(parts) >= 2 else host  # Take last two parts
+
+
+def _sitemap_location_cache(session: requests.Session) -> Dict[str, str]:
+    cache = getattr(session, _SITEMAP_LOCATIONS_ATTR, None)
+    if cache is None:
+        cache = {}
+        setattr(session, _SITEMAP_LOCATIONS_ATTR, cache)
+    return cache
+
+
+def _iter_sitemap_candidates(
+    base_url: str,
+    session: requests.Session,
+    cached: Optional[str],
+    robots_sitemaps: Optional[List[str]],
+    homepage: Optional[_HomepageLinkParser],
+) -> Iterator[str]:
+    """
+    Sitemap locations to probe, most likely first; consumed lazily so later probes only run on a miss.
+
+    顺序：缓存 → robots.txt 的 Sitemap 声明 → /sitemap.xml → /sitemap_index.xml → 首页 <link rel="sitemap">
+    """
+    from .sitemap import _discover_sitemaps_from_robots
+
+    parsed = urlparse(base_url)
+    site_root = f"{parsed.scheme}://{parsed.netloc.lower()}"
+    if cached:
+        yield cached
+    if robots_sitemaps is None:
+        robots_sitemaps = _discover_sitemaps_from_robots(base_url, session)
+    yield from robots_sitemaps
+    yield f"{site_root}/sitemap.xml"
+    yield f"{site_root}/sitemap_index.xml"
+    if homepage is None:
+        homepage = _parse_homepage(base_url, session)
+    if homepage is not None:
+        for href in homepage.sitemap_links:
+            yield urljoin(base_url, href)
+
+
+def _hosts_from_sitemap(
+    sitemap_url: str, session: requests.Session, root_domain: str
+) -> Optional[Set[str]]:
+    """
+    Hosts under root_domain listed in a sitemap (index), or None when the location is a miss:
+    it cannot be fetched, does not parse, or lists no URLs.
+    """
+    from .sitemap import _expand_sitemap_candidates, _fetch_sitemap_entries, _is_sitemap_url
+
+    try:
+        # 流式解析会识别 gzip（robots.txt 中常见 *.xml.gz 声明）
+        urls = _fetch_sitemap_entries(sitemap_url, session)
+
+        # If it's a sitemap index, expand it
+        if any(_is_sitemap_url(u) for u in urls):
+            urls = _expand_sitemap_candidates(urls, session, set())
+    except Exception:  # noqa: BLE001
+        return None
+    if not urls:
+        return None
+
+    # Extract domains from all URLs
+    hosts: Set[str] = set()
+    for url in urls:
+        try:
+            host = urlparse(url).netloc.lower()
+        except Exception:  # noqa: BLE001
+            continue
+        if host and root_domain in host:
+            hosts.add(host)
+    return hosts
+
+
 def discover_subdomains_from_sitemap(
-    base_url: str, session: requests.Session
+    base_url: str,
+    session: requests.Session,
+    robots_sitemaps: Optional[List[str]] = None,
+    homepage: Optional[_HomepageLinkParser] = None,
 ) -> Set[str]:
     """
     Automatically discover all subdomains from sitemap
 
+    Sitemap locations are probed in order (cached location, robots.txt, /sitemap.xml,
+    /sitemap_index.xml, <link rel="sitemap">) and the first one that answers is used.
+    A base_url that already points at an .xml / .xml.gz file is used directly.
+
     Args:
         base_url: Base URL, e.g. https://www.example.com
         session: requests session
+        robots_sitemaps: Sitemap URLs already read from robots.txt (fetched on demand if None)
+        homepage: Already parsed homepage (fetched on demand if None)
 
     Returns:
         Set of discovered subdomains, e.g. {'www.example.com', 'docs.example.com', 'blog.example.com'}
@@ -35,53 +159,28 @@ def discover_subdomains_from_sitemap(
     main_domain = parsed.netloc.lower()
 
     # Extract root domain (e.g. thordata.com)
-    parts = main_domain.split(".")
-    if len(parts) >= 2:
-        root_domain = ".".join(parts[-2:])  # Take last two parts
-    else:
-        root_domain = main_domain
+    root_domain = _root_domain(main_domain)
 
     discovered.add(main_domain)  # Add main domain
 
-    # Try to get sitemap
-    sitemap_urls = [
-        f"{parsed.scheme}://{main_domain}/sitemap.xml",
-        f"{parsed.scheme}://{main_domain}/sitemap_index.xml",
-    ]
+    locations = _sitemap_location_cache(session)
+    if parsed.path.lower().endswith((".xml", ".xml.gz")):
+        candidates: Iterable[str] = (base_url,)
+    else:
+        candidates = _iter_sitemap_candidates(
+            base_url, session, locations.get(main_domain), robots_sitemaps, homepage
+        )
 
-    for sitemap_url in sitemap_urls:
-        try:
-            resp = session.get(sitemap_url, timeout=10)
-            if resp.status_code == 200:
-                # Parse sitemap, extract all URL domains
-                from .sitemap import _parse_sitemap_xml, _expand_sitemap_index
-
-                seen: Set[str] = set()
-                urls = _parse_sitemap_xml(resp.text, source_url=sitemap_url)
-
-                # If it's a sitemap index, expand it
-                if any(u.endswith(".xml") for u in urls):
-                    all_urls: List[str] = []
-                    for u in urls:
-                        if u.endswith(".xml"):
-                            all_urls.extend(_expand_sitemap_index(u, session, seen))
-                        else:
-                            all_urls.append(u)
-                    urls = all_urls
-
-                # Extract domains from all URLs
-                for url in urls:
-                    try:
-                        u_parsed = urlparse(url)
-                        host = u_parsed.netloc.lower()
-                        if host and root_domain in host:
-                            discovered.add(host)
-                    except Exception:
-                        continue
-
-                break  # Exit after successfully getting sitemap
-        except Exception:
+    tried: Set[str] = set()
+    for sitemap_url in candidates:
+        if sitemap_url in tried:
             continue
+        tried.add(sitemap_url)
+        hosts = _hosts_from_sitemap(sitemap_url, session, root_domain)
+        if hosts is not None:
+            locations[main_domain] = sitemap_url
+            discovered.update(hosts)
+            break  # Exit after successfully getting sitemap
 
     return discovered
 
@@ -97,6 +196,8 @@ def discover_subdomains_comprehensive(
     2. From robots.txt (Sitemap declarations)
     3. From crawling homepage links
 
+    robots.txt and the homepage are fetched once and shared by all three methods.
+
     Args:
         base_url: Base URL
         session: requests session
@@ -104,83 +205,50 @@ def discover_subdomains_comprehensive(
     Returns:
         Set of all discovered subdomains
     """
+    from .sitemap import _discover_sitemaps_from_robots
+
     discovered: Set[str] = set()
 
     parsed = urlparse(base_url)
     main_domain = parsed.netloc.lower()
-    scheme = parsed.scheme
 
     # Extract root domain
-    parts = main_domain.split(".")
-    if len(parts) >= 2:
-        root_domain = ".".join(parts[-2:])
-    else:
-        root_domain = main_domain
+    root_domain = _root_domain(main_domain)
 
     discovered.add(main_domain)
 
+    robots_sitemaps = _discover_sitemaps_from_robots(base_url, session)
+    homepage = _parse_homepage(base_url, session)
+
     # Method 1: From sitemap
     try:
-        sitemap_subdomains = discover_subdomains_from_sitemap(base_url, session)
+        sitemap_subdomains = discover_subdomains_from_sitemap(
+            base_url, session, robots_sitemaps=robots_sitemaps, homepage=homepage
+        )
         discovered.update(sitemap_subdomains)
         logger.info(f"Discovered {len(sitemap_subdomains)} subdomains from sitemap")
     except Exception as e:
         logger.warning(f"Failed to discover subdomains from sitemap: {e}")
 
     # Method 2: From robots.txt
-    try:
-        robots_url = f"{scheme}://{main_domain}/robots.txt"
-        resp = session.get(robots_url, timeout=10)
-        if resp.status_code == 200:
-            for line in resp.text.splitlines():
-                line = line.strip()
-                if line.lower().startswith("sitemap:"):
-                    sitemap_url = line.split(":", 1)[1].strip()
-                    try:
-                        sitemap_parsed = urlparse(sitemap_url)
-                        sitemap_host = sitemap_parsed.netloc.lower()
-                        if sitemap_host and root_domain in sitemap_host:
-                            discovered.add(sitemap_host)
-                    except Exception:
-                        continue
-    except Exception as e:
-        logger.debug(f"Could not read robots.txt: {e}")
+    for sitemap_url in robots_sitemaps:
+        try:
+            sitemap_host = urlparse(sitemap_url).netloc.lower()
+        except Exception:  # noqa: BLE001
+            continue
+        if sitemap_host and root_domain in sitemap_host:
+            discovered.add(sitemap_host)
 
     # Method 3: From homepage links (limited crawl)
-    try:
-        resp = session.get(base_url, timeout=10)
-        if resp.status_code == 200:
-            from html.parser import HTMLParser
-
-            class LinkExtractor(HTMLParser):
-                def __init__(self):
-                    super().__init__()
-                    self.links = set()
-
-                def handle_starttag(self, tag, attrs):
-                    if tag.lower() == "a":
-                        for k, v in attrs:
-                            if k.lower() == "href":
-                                if v:
-                                    self.links.add(v)
-
-            parser = LinkExtractor()
-            parser.feed(resp.text)
-
-            for href in parser.links:
-                try:
-                    # Resolve relative URLs
-                    from urllib.parse import urljoin
-
-                    abs_url = urljoin(base_url, href)
-                    u_parsed = urlparse(abs_url)
-                    host = u_parsed.netloc.lower()
-                    if host and root_domain in host and host not in discovered:
-                        discovered.add(host)
-                except Exception:
-                    continue
-    except Exception as e:
-        logger.debug(f"Could not extract subdomains from homepage: {e}")
+    if homepage is not None:
+        for href in homepage.links:
+            try:
+                # Resolve relative URLs
+                host = urlparse(urljoin(base_url, href)).netloc.lower()
+            except Exception:  # noqa: BLE001
+                continue
+            if host and root_domain in host:
+                discovered.add(host)
 
     return discovered
 
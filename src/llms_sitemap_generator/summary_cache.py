@@ -0,0 +1,123 @@
+"""
+On-disk cache of page summaries (title + description)
+页面摘要的磁盘缓存：按 URL 保存 ETag / Last-Modified，重复运行时用条件请求（304）跳过下载和解析
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from .config import _DATACLASS_OPTS, FetchConfig
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_CACHE_FILE = "summaries.sqlite3"
+# 每写入这么多条就提交一次：运行中途被中断时已抓取的摘要不会全部丢失
+_COMMIT_EVERY = 100
+
+
+@dataclass(**_DATACLASS_OPTS)
+class CachedSummary:
+    title: str
+    description: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class SummaryCache:
+    """
+    SQLite-backed summary store, safe to share between the fetch worker threads.
+    Entries younger than ttl_s seconds are reused without any request; older ones are revalidated.
+    """
+
+    def __init__(self, path: Path, ttl_s: float = 0) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            "key TEXT PRIMARY KEY, title TEXT, description TEXT, "
+            "etag TEXT, last_modified TEXT, fetched_at REAL)"
+        )
+
+    @staticmethod
+    def _key(url: str, site_name: Optional[str]) -> str:
+        # 生成的描述文本依赖 site_name，因此一起作为键
+        return f"{url}\n{site_name or ''}"
+
+    def lookup(self, url: str, site_name: Optional[str]) -> Optional[CachedSummary]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT title, description, etag, last_modified, fetched_at "
+                "FROM summaries WHERE key = ?",
+                (self._key(url, site_name),),
+            ).fetchone()
+        return CachedSummary(*row) if row else None
+
+    def is_fresh(self, entry: CachedSummary) -> bool:
+        return self.ttl_s > 0 and time.time() - entry.fetched_at < self.ttl_s
+
+    def store(
+        self,
+        url: str,
+        site_name: Optional[str],
+        title: str,
+        description: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?, ?)",
+                (self._key(url, site_name), title, description, etag, last_modified, time.time()),
+            )
+            self._written()
+
+    def touch(self, url: str, site_name: Optional[str]) -> None:
+        """Mark an entry as just revalidated (server answered 304)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE summaries SET fetched_at = ? WHERE key = ?",
+                (time.time(), self._key(url, site_name)),
+            )
+            self._written()
+
+    def _written(self) -> None:
+        # 调用方已持有 self._lock
+        self._pending += 1
+        if self._pending >= _COMMIT_EVERY:
+            self._conn.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+
+def open_summary_cache(fetch: FetchConfig) -> Optional[SummaryCache]:
+    """Open the cache configured by fetch.cache_dir, or return None when caching is off."""
+    if not fetch.cache_dir:
+        return None
+    path = Path(fetch.cache_dir).expanduser() / _CACHE_FILE
+    try:
+        return SummaryCache(path, ttl_s=fetch.cache_ttl)
+    except Exception as e:  # noqa: BLE001 - caching is best-effort
+        logger.warning(f"Summary cache disabled, cannot open {path}: {e}")
+        return None
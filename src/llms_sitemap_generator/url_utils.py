@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from urllib.parse import urlparse, urlunparse
 
 
-_SKIP_EXTENSIONS = {
+_SKIP_EXTENSIONS = (
     ".pdf",
     ".png",
     ".jpg",
@@ -27,7 +28,7 @@ _SKIP_EXTENSIONS = {
     ".woff2",
     ".ttf",
     ".eot",
-}
+)
 
 
 def root_domain_from_host(host: str) -> str:
@@ -55,8 +56,22 @@ def normalize_url(
     - (optionally) force https for http/https URLs
     - (optionally) drop fragment (#...)
     - (optionally) strip trailing slash (except for root '/')
+
+    Results are memoized: crawled pages repeat the same nav/footer links, so most
+    calls are re-normalizations of a URL that was already seen.
     """
-    parsed = urlparse(url.strip())
+    return _normalize_url(url, prefer_https, drop_fragment, strip_trailing_slash)
+
+
+@lru_cache(maxsize=65536)
+def _normalize_url(
+    url: str, prefer_https: bool, drop_fragment: bool, strip_trailing_slash: bool
+) -> str:
+    url = url.strip()
+    if drop_fragment:
+        # 先切掉 #fragment，urlparse 就不必再拆分它
+        url = url.partition("#")[0]
+    parsed = urlparse(url)
     scheme = parsed.scheme or "https"
     if prefer_https and scheme in {"http", "https"}:
         scheme = "https"
@@ -69,12 +84,13 @@ def normalize_url(
     return rebuilt
 
 
+def path_has_skipped_extension(path: str) -> bool:
+    """Same as should_skip_by_extension, for an already-parsed (lower-cased) path."""
+    return path.endswith(_SKIP_EXTENSIONS)
+
+
 def should_skip_by_extension(url: str) -> bool:
-    path = urlparse(url).path.lower()
-    for ext in _SKIP_EXTENSIONS:
-        if path.endswith(ext):
-            return True
-    return False
+    return urlparse(url).path.lower().endswith(_SKIP_EXTENSIONS)
 
 
 def is_same_root_domain(host: str, root_domain: str) -> bool: